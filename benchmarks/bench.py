@@ -0,0 +1,213 @@
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gis_common.paths import path_log_returns, simulate_gbm_paths
+from gis_common.pipeline import CALL_STRIKE_FACTORS, PUT_STRIKE_FACTORS, WINDOWS, option_frames
+from gis_common.pricing import black_scholes_chain
+from gis_common.storage import dataset_path, read_dataset, write_dataset
+from gis_common.volatility import rolling_std
+
+# Stages of the generator and plotting scripts, in pipeline order
+STAGES = ["simulate", "rolling_std", "pricing", "frame", "write", "read", "render"]
+
+# Rough peak bytes per simulated day across all stages, used to skip sizes
+# that would not fit in the memory budget
+BYTES_PER_DAY = 1500
+
+
+def default_memory_budget():
+    try:
+        return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES") // 2
+    except (ValueError, OSError, AttributeError):
+        return 4 * 1024 ** 3
+
+
+def wall_time(fn):
+    """Run fn once untraced and return (result, wall seconds)."""
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def peak_memory(fn):
+    """
+    Run fn once under tracemalloc and return its peak traced bytes above the
+    starting point.
+
+    Tracing slows Python-heavy stages several times over, so this run is
+    separate from the timed ones. tracemalloc sees Python and NumPy
+    allocations but not buffers allocated inside pyarrow or matplotlib's
+    renderer.
+    """
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        fn()
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+
+def run_size(n_days, stages, output_format, repeat, tmp_dir, seed=100):
+    """Benchmark every requested stage for one history length; returns a list of result dicts."""
+    rng = np.random.default_rng(seed)
+    state = {}
+
+    def simulate():
+        return simulate_gbm_paths(1, n_days, 100, rng=rng)[0]
+
+    def rolling():
+        return np.nan_to_num(rolling_std(path_log_returns(state["close"]), WINDOWS), nan=0.0)
+
+    def pricing():
+        close = state["close"]
+        strikes = np.stack([close[:, None] * state["call_factors"], close[:, None] * state["put_factors"]])
+        return black_scholes_chain(close[:, None], strikes, 30 / 365, 0.05, state["volatilities"][:, None],
+                                   np.array([True, False])[:, None, None])
+
+    def frame():
+        dates = np.busday_offset(np.datetime64("1930-01-01", "D"), np.arange(n_days), roll="forward")
+        return option_frames(dates, state["close"], state["rolling_stds"], WINDOWS, state["volatilities"],
+                             state["call_factors"], state["put_factors"], 30, 0.05)
+
+    stem = os.path.join(tmp_dir, f"bench_{n_days}")
+
+    def write():
+        calls_df, puts_df = state["frames"]
+        return write_dataset(stem, {"Calls": calls_df, "Puts": puts_df}, output_format)
+
+    def read():
+        if output_format == "xlsx":
+            # read_dataset would serve every repeat after the first from its Parquet sidecar
+            return pd.read_excel(dataset_path(stem, "Calls", "xlsx"), sheet_name="Calls")
+        return read_dataset(stem, sheet_name="Calls", output_format=output_format)
+
+    def render():
+        import matplotlib.pyplot as plt
+
+        calls_df = state["frames"][0]
+        fig = plt.figure(figsize=(12, 6))
+        for column in ["Call Price_ITM_1", "Call Price_ITM_2", "Call Price_OTM_1", "Call Price_OTM_2"]:
+            plt.plot(calls_df["Date"], calls_df[column], label=column)
+        plt.legend()
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format="png")
+        plt.close(fig)
+        return buffer.getbuffer().nbytes
+
+    functions = {
+        "simulate": simulate, "rolling_std": rolling, "pricing": pricing, "frame": frame,
+        "write": write, "read": read, "render": render,
+    }
+
+    if "render" in stages:
+        # Import outside the timed region; only rendering itself is measured
+        import matplotlib
+        matplotlib.use("Agg")
+        import matplotlib.pyplot  # noqa: F401
+
+    # Later stages need the outputs of earlier ones even when those are not benchmarked
+    state["close"] = simulate()
+    state["rolling_stds"] = rolling()
+    state["call_factors"] = rng.uniform(*np.array(CALL_STRIKE_FACTORS).T, (n_days, len(CALL_STRIKE_FACTORS)))
+    state["put_factors"] = rng.uniform(*np.array(PUT_STRIKE_FACTORS).T, (n_days, len(PUT_STRIKE_FACTORS)))
+    state["volatilities"] = rng.uniform(0.01, 0.4, n_days)
+    if {"frame", "write", "read", "render"} & set(stages):
+        state["frames"] = frame()
+    if "read" in stages and "write" not in stages:
+        write()
+
+    results = []
+    for stage in stages:
+        best = min(wall_time(functions[stage])[1] for _ in range(repeat))
+        peak = peak_memory(functions[stage])
+        results.append({
+            "stage": stage,
+            "n_days": n_days,
+            "wall_s": best,
+            "days_per_s": n_days / best if best > 0 else float("inf"),
+            "peak_mb": peak / 1e6,
+        })
+        print(f"{stage:>12} {n_days:>12,d} days  {best:9.4f} s  {results[-1]['days_per_s']:14,.0f} days/s"
+              f"  {results[-1]['peak_mb']:9.1f} MB", flush=True)
+    return results
+
+
+def environment():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                                cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except OSError:
+        commit = ""
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def compare(base_path, new_path):
+    """Print per-stage speedups of new_path over base_path."""
+    with open(base_path) as f:
+        base = {(r["stage"], r["n_days"]): r for r in json.load(f)["results"]}
+    with open(new_path) as f:
+        new = json.load(f)["results"]
+
+    print(f"{'stage':>12} {'n_days':>12} {'base s':>10} {'new s':>10} {'speedup':>8} {'base MB':>9} {'new MB':>9}")
+    for r in new:
+        b = base.get((r["stage"], r["n_days"]))
+        if b is None:
+            continue
+        speedup = b["wall_s"] / r["wall_s"] if r["wall_s"] > 0 else float("inf")
+        print(f"{r['stage']:>12} {r['n_days']:>12,d} {b['wall_s']:10.4f} {r['wall_s']:10.4f} {speedup:7.2f}x"
+              f" {b['peak_mb']:9.1f} {r['peak_mb']:9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the generation, I/O and plotting stages.")
+    parser.add_argument("--sizes", type=float, nargs="+", default=[1e4, 1e6, 1e8],
+                        help="history lengths in days (sizes over the memory budget are skipped)")
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=STAGES)
+    parser.add_argument("--format", dest="output_format", choices=["parquet", "feather", "xlsx"], default="parquet")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="untraced runs per stage; the fastest is reported (plus one traced run for memory)")
+    parser.add_argument("--memory-budget-gb", type=float, default=default_memory_budget() / 1024 ** 3)
+    parser.add_argument("--output", default="bench_results.json")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"), help="compare two result files and exit")
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in args.sizes:
+            n_days = int(size)
+            if n_days * BYTES_PER_DAY > args.memory_budget_gb * 1024 ** 3:
+                print(f"Skipping {n_days:,d} days: needs about {n_days * BYTES_PER_DAY / 1024 ** 3:.1f} GB")
+                continue
+            results.extend(run_size(n_days, args.stages, args.output_format, args.repeat, tmp_dir))
+
+    with open(args.output, "w") as f:
+        json.dump({"environment": environment(), "format": args.output_format, "results": results}, f, indent=2)
+    print(f"Results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import argparse
+import http.client
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from multiprocessing import Pool
+
+import numpy as np
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """http.client connection over a Unix socket."""
+
+    def __init__(self, path):
+        super().__init__("localhost")
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.connect(self.unix_path)
+
+
+def connect(args):
+    if args.unix:
+        return UnixHTTPConnection(args.unix)
+    return http.client.HTTPConnection("127.0.0.1", args.port)
+
+
+def wait_for_server(args, timeout=30):
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            conn = connect(args)
+            conn.request("GET", "/metrics")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("pricing server did not start")
+
+
+def run_client(task):
+    """One client process: send requests back to back over a keep-alive connection."""
+    args, client_id = task
+    rng = np.random.default_rng(client_id)
+    conn = connect(args)
+    latencies = []
+    for _ in range(args.requests):
+        n = args.contracts
+        body = json.dumps({
+            "S": rng.uniform(50, 150, n).tolist(),
+            "K": rng.uniform(50, 150, n).tolist(),
+            "T": 30 / 365,
+            "r": 0.05,
+            "sigma": rng.uniform(0.01, 0.4, n).tolist(),
+            "option_type": rng.choice(["call", "put"], n).tolist(),
+        })
+        start = time.perf_counter()
+        conn.request("POST", args.endpoint, body, {"Content-Type": "application/json"})
+        response = conn.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+        if response.status != 200:
+            raise RuntimeError(f"request failed with HTTP {response.status}")
+    conn.close()
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the local pricing server with concurrent client processes.")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent client processes")
+    parser.add_argument("--requests", type=int, default=200, help="requests per client")
+    parser.add_argument("--contracts", type=int, default=16, help="contracts per request")
+    parser.add_argument("--endpoint", choices=["/price", "/greeks"], default="/price")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="use a Unix socket instead of TCP")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0)
+    parser.add_argument("--output", help="also save the results as JSON")
+    args = parser.parse_args()
+
+    command = [sys.executable, "-m", "gis_common.server", "--port", str(args.port),
+               "--batch-window-ms", str(args.batch_window_ms)]
+    if args.unix:
+        command += ["--unix", args.unix]
+    server = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        wait_for_server(args)
+        start = time.perf_counter()
+        with Pool(args.clients) as pool:
+            latencies = np.concatenate(pool.map(run_client, [(args, i) for i in range(args.clients)]))
+        elapsed = time.perf_counter() - start
+
+        conn = connect(args)
+        conn.request("GET", "/metrics")
+        server_metrics = json.loads(conn.getresponse().read())
+        conn.close()
+    finally:
+        server.terminate()
+        server.wait()
+        if args.unix and os.path.exists(args.unix):
+            os.remove(args.unix)
+
+    results = {
+        "clients": args.clients,
+        "requests": int(latencies.size),
+        "contracts_per_request": args.contracts,
+        "requests_per_s": latencies.size / elapsed,
+        "contracts_per_s": latencies.size * args.contracts / elapsed,
+        "client_latency_ms": {f"p{q:g}": float(np.percentile(latencies, q) * 1e3) for q in (50, 90, 99, 99.9)},
+        "server": server_metrics,
+    }
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+import time
+
+# Cache location and size limit, overridable from the environment
+CACHE_DIR_VAR = "GIS_CACHE_DIR"
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "gis_datasets")
+DEFAULT_MAX_BYTES = 10 * 1024 ** 3
+
+# Modules whose source determines the generated rows; editing any of them
+# changes every key
+CODE_MODULES = ["generator.py", "pipeline.py", "pricing.py", "volatility.py", "paths.py", "storage.py"]
+
+ENTRY_FILE = "entry.json"
+# Entries are assembled here and moved into place when complete, so
+# entries() never sees a partial one
+STAGING_DIR = ".staging"
+
+_code_versions = {}
+
+
+def code_version(modules=CODE_MODULES):
+    """SHA-256 over the source of the given gis_common modules, computed once per process."""
+    modules = tuple(modules)
+    if modules not in _code_versions:
+        digest = hashlib.sha256()
+        here = os.path.dirname(os.path.abspath(__file__))
+        for name in modules:
+            with open(os.path.join(here, name), "rb") as f:
+                digest.update(name.encode() + b"\0" + f.read())
+        _code_versions[modules] = digest.hexdigest()
+    return _code_versions[modules]
+
+
+def dataset_key(params):
+    """
+    Canonical hash of every generation parameter plus the code version.
+
+    params must be JSON-serializable (tuples and arrays as lists); key order
+    does not matter.
+    """
+    canonical = json.dumps({"params": params, "code_version": code_version()}, sort_keys=True,
+                           separators=(",", ":"))
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+def _copy(src, dst):
+    # Datasets are copied, never hard-linked: rewriting the output in place
+    # must not change the cached copy
+    if os.path.isdir(dst):
+        shutil.rmtree(dst)
+    if os.path.isdir(src):
+        shutil.copytree(src, dst)
+        os.utime(dst)  # Restored outputs count as newly written (see storage.find_format)
+    else:
+        shutil.copyfile(src, dst)
+
+
+def _size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+class DatasetCache:
+    """
+    Content-addressed store of generated datasets.
+
+    Every entry lives in <cache_dir>/<key>/ with the dataset files and an
+    entry.json holding the parameters and size. store() writes it under
+    <cache_dir>/.staging/ first, so several processes can store at once. The mtime of entry.json is
+    the last use, so eviction drops the least recently used entries once the
+    cache grows beyond max_bytes.
+
+        cache = DatasetCache()
+        key = dataset_key(params)
+        if not cache.restore(key, paths):
+            write_dataset(...)
+            cache.store(key, paths, params)
+    """
+
+    def __init__(self, cache_dir=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.cache_dir = cache_dir or os.environ.get(CACHE_DIR_VAR, DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+
+    def _entry(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    def restore(self, key, paths):
+        """
+        Copy the cached files of key to paths (matched by file name) and mark
+        the entry as used. Returns False when key is not cached.
+        """
+        entry = self._entry(key)
+        try:
+            with open(os.path.join(entry, ENTRY_FILE)) as f:
+                files = json.load(f)["files"]
+        except FileNotFoundError:
+            return False
+        if sorted(files) != sorted(os.path.basename(path) for path in paths):
+            return False
+        for path in paths:
+            _copy(os.path.join(entry, os.path.basename(path)), path)
+        os.utime(os.path.join(entry, ENTRY_FILE))
+        return True
+
+    def store(self, key, paths, params):
+        """Add the written files of a dataset under key, then evict down to max_bytes."""
+        entry = self._entry(key)
+        tmp = os.path.join(self.cache_dir, STAGING_DIR, f"{key}.tmp-{os.getpid()}")
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        for path in paths:
+            _copy(path, os.path.join(tmp, os.path.basename(path)))
+        meta = {
+            "params": params,
+            "files": [os.path.basename(path) for path in paths],
+            "bytes": sum(_size(path) for path in paths),
+            "created": time.time(),
+        }
+        with open(os.path.join(tmp, ENTRY_FILE), "w") as f:
+            json.dump(meta, f, indent=2)
+
+        shutil.rmtree(entry, ignore_errors=True)
+        try:
+            os.replace(tmp, entry)
+        except OSError:
+            if not os.path.exists(os.path.join(entry, ENTRY_FILE)):
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)  # Another process stored the same key meanwhile
+        self.evict()
+
+    def entries(self):
+        """(key, bytes, last used) of every entry, least recently used first."""
+        entries = []
+        for key in os.listdir(self.cache_dir) if os.path.isdir(self.cache_dir) else []:
+            if key == STAGING_DIR:
+                continue
+            try:
+                path = os.path.join(self._entry(key), ENTRY_FILE)
+                with open(path) as f:
+                    entries.append((key, json.load(f)["bytes"], os.path.getmtime(path)))
+            except (FileNotFoundError, NotADirectoryError, json.JSONDecodeError):
+                continue  # Not an entry, or removed by another process
+        return sorted(entries, key=lambda e: e[2])
+
+    def evict(self, max_bytes=None):
+        """Remove least recently used entries until the cache fits in max_bytes. Returns the removed keys."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = []
+        for key, size, _ in entries:
+            if total <= max_bytes:
+                break
+            shutil.rmtree(self._entry(key), ignore_errors=True)
+            total -= size
+            removed.append(key)
+        return removed
+
+    def clear(self):
+        return self.evict(0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect or trim the generated dataset cache.")
+    parser.add_argument("--cache-dir", default=None, help=f"default: ${CACHE_DIR_VAR} or {DEFAULT_CACHE_DIR}")
+    parser.add_argument("--max-gb", type=float, help="evict least recently used entries down to this size")
+    parser.add_argument("--clear", action="store_true", help="remove every entry")
+    args = parser.parse_args()
+
+    cache = DatasetCache(args.cache_dir)
+    if args.clear:
+        cache.clear()
+    elif args.max_gb is not None:
+        cache.evict(int(args.max_gb * 1024 ** 3))
+    for key, size, used in cache.entries():
+        print(f"{key[:16]}  {size / 1e6:9.1f} MB  last used {time.strftime('%Y-%m-%d %H:%M', time.localtime(used))}")
+
+
+if __name__ == "__main__":
+    main()
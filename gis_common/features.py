@@ -0,0 +1,188 @@
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from gis_common.cache import code_version
+from gis_common.paths import path_log_returns
+from gis_common.pipeline import WINDOWS, annualized_std, nominal_volatility, percent_volatility
+from gis_common.volatility import rolling_std
+
+# Modules whose source determines the stage values; editing any of them
+# invalidates every cached stage, including those saved in a cache_dir
+FEATURE_MODULES = ["features.py", "pipeline.py", "volatility.py", "paths.py"]
+
+
+def _fingerprint(*parts):
+    return hashlib.sha256(repr(parts).encode()).hexdigest()
+
+
+def _stage_fingerprint(rule, params, dep_fingerprints):
+    return _fingerprint(code_version(FEATURE_MODULES), rule.__name__, params, dep_fingerprints)
+
+
+def _array_fingerprint(values):
+    values = np.ascontiguousarray(values, dtype=float)
+    return _fingerprint("input", values.shape, hashlib.sha256(values.data).hexdigest())
+
+
+class FeatureGraph:
+    """
+    The volatility features as a dependency graph of named, cached stages:
+
+        close -> log_returns -> rolling_std_<w> -> annualized_std_<w>
+              -> <w>_Day_Percent_Volatility
+        annualized_std_<w>, close, volatilities -> <w>_Day_Volatility
+
+    Every stage is identified by a fingerprint of its rule, its parameters
+    and the fingerprints of its inputs (the inputs themselves are hashed by
+    content). A stage is only evaluated when no cached value has its
+    fingerprint, so adding a window computes that window's chain alone, and
+    changing trading_days or percent_scale keeps the log returns and rolling
+    standard deviations. Requesting some columns evaluates only the stages
+    they depend on.
+
+    With cache_dir, stage values are also saved there as <fingerprint>.npy
+    and reused by later runs on the same inputs and code (the fingerprints
+    include a hash of FEATURE_MODULES). Least recently used files are
+    removed once the directory holds more than max_cache_bytes.
+
+        graph = FeatureGraph(close, volatilities)
+        df = graph.frame(["30_Day_Volatility"])   # log returns, 30-day chain only
+        graph.windows = [*graph.windows, 120]
+        df = graph.frame()                        # only the 120-day chain is new
+
+    Rolling stds are computed one window at a time rather than in the
+    generators' single multi-window sweep, so on long histories they can
+    differ from pipeline.volatility_features by rounding; on the default
+    splits every column is identical.
+    """
+
+    def __init__(self, close, volatilities, windows=WINDOWS, trading_days=252, percent_scale=100,
+                 cache_dir=None, max_cache_bytes=1024 ** 3):
+        self.windows = list(windows)
+        self.trading_days = trading_days
+        self.percent_scale = percent_scale
+        self.cache_dir = cache_dir
+        self.max_cache_bytes = max_cache_bytes
+        self._inputs = {}
+        self._cache = {}
+        self.evaluated = []  # stages computed (not served from a cache) by the last frame()
+        self.set_input("close", close)
+        self.set_input("volatilities", volatilities)
+
+    def set_input(self, name, values):
+        """Replace an input ("close" or "volatilities"); dependent stages are recomputed on demand."""
+        values = np.asarray(values, dtype=float)
+        self._inputs[name] = (values, _array_fingerprint(values))
+
+    def stages(self):
+        """name -> (rule, parameters, dependencies) of every stage for the current settings."""
+        stages = {"log_returns": (self._log_returns, (), ["close"])}
+        for w in self.windows:
+            stages[f"rolling_std_{w}"] = (self._rolling_std, (w,), ["log_returns"])
+            stages[f"annualized_std_{w}"] = (self._annualized, (self.trading_days,), [f"rolling_std_{w}"])
+            stages[f"{w}_Day_Volatility"] = (self._nominal, (), [f"annualized_std_{w}", "close", "volatilities"])
+            stages[f"{w}_Day_Percent_Volatility"] = (self._percent, (w, self.trading_days, self.percent_scale),
+                                                     [f"annualized_std_{w}"])
+        return stages
+
+    @property
+    def columns(self):
+        """Output feature columns, in the order of pipeline.volatility_features."""
+        return [f"{w}_Day_Volatility" for w in self.windows] + [f"{w}_Day_Percent_Volatility" for w in self.windows]
+
+    def get(self, name):
+        """Value of one stage or input, evaluating only what it depends on."""
+        return self._evaluate(name, self.stages())[0]
+
+    def frame(self, columns=None):
+        """DataFrame of the requested feature columns (default: all of them)."""
+        stages = self.stages()
+        self.evaluated = []
+        data = {name: self._evaluate(name, stages)[0] for name in (self.columns if columns is None else columns)}
+        self._prune(stages)
+        return pd.DataFrame(data, copy=False)
+
+    def _evaluate(self, name, stages):
+        if name in self._inputs:
+            return self._inputs[name]
+        if name not in stages:
+            raise KeyError(f"unknown feature stage {name!r}")
+        # Dependencies are only evaluated when this stage is not cached
+        key = self._evaluate_key(name, stages)
+        if key not in self._cache:
+            value = self._load(key)
+            if value is None:
+                rule, params, deps = stages[name]
+                value = rule(*params, *[self._evaluate(dep, stages)[0] for dep in deps])
+                self.evaluated.append(name)
+                self._save(key, value)
+            self._cache[key] = value
+        return self._cache[key], key
+
+    def _prune(self, stages):
+        # Keep the values that the current settings can still reach
+        live = {self._evaluate_key(name, stages) for name in stages}
+        for key in set(self._cache) - live:
+            del self._cache[key]
+
+    def _evaluate_key(self, name, stages):
+        if name in self._inputs:
+            return self._inputs[name][1]
+        rule, params, deps = stages[name]
+        return _stage_fingerprint(rule, params, [self._evaluate_key(dep, stages) for dep in deps])
+
+    def _load(self, key):
+        path = self.cache_dir and os.path.join(self.cache_dir, key + ".npy")
+        if not path or not os.path.exists(path):
+            return None
+        os.utime(path)  # The mtime is the last use, for eviction
+        return np.load(path)
+
+    def _save(self, key, value):
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = os.path.join(self.cache_dir, key + ".npy")
+            np.save(path + ".tmp.npy", value)
+            os.replace(path + ".tmp.npy", path)
+            self._evict_files()
+
+    def _evict_files(self):
+        files = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.endswith(".npy") and not entry.name.endswith(".tmp.npy"):
+                stat = entry.stat()
+                files.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files):
+            if total <= self.max_cache_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # Removed by another process
+            total -= size
+
+    # Stage rules: thin adapters over the functions pipeline.volatility_features uses
+
+    @staticmethod
+    def _log_returns(close):
+        return path_log_returns(close)
+
+    @staticmethod
+    def _rolling_std(w, log_returns):
+        return np.nan_to_num(rolling_std(log_returns, [w])[0], nan=0.0)
+
+    @staticmethod
+    def _annualized(trading_days, rolling_stds):
+        return annualized_std(rolling_stds, trading_days)
+
+    @staticmethod
+    def _nominal(annualized_stds, close, volatilities):
+        return nominal_volatility(annualized_stds, close, volatilities)
+
+    @staticmethod
+    def _percent(w, trading_days, percent_scale, annualized_stds):
+        return percent_volatility(annualized_stds, w, trading_days, percent_scale)
@@ -0,0 +1,240 @@
+import argparse
+import inspect
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from gis_common.cache import DatasetCache, dataset_key
+from gis_common.paths import path_log_returns
+from gis_common.pipeline import CALL_STRIKE_FACTORS, PUT_STRIKE_FACTORS, WINDOWS, chain_tables, option_frames
+from gis_common.profiling import phase, profiler
+from gis_common.storage import dataset_path, read_dataset, remove_segments, write_dataset
+from gis_common.volatility import rolling_std
+
+# Parameters of the train/validation/test datasets; everything else is shared
+SPLITS = {
+    "train": {"stem": "training_data_synthetic_4", "n_days": 15090, "initial_price": 100,
+              "start_date": "1930-01-01"},
+    "val": {"stem": "validation_data_synthetic_4", "n_days": 5090, "initial_price": 349.759615445901,
+            "start_date": "1987-11-04"},
+    "test": {"stem": "testing_data_synthetic_4", "n_days": 5090, "initial_price": 190.623391982309,
+             "start_date": "2007-05-09"},
+}
+
+# Order in which the split scripts drew the strike-factor columns
+# (ITM calls were drawn first but are stored after the OTM ones)
+CALL_DRAW_ORDER = [2, 3, 0, 1]
+PUT_DRAW_ORDER = [0, 1, 2, 3]
+
+# Sheets written for each layout: "wide" is the original Calls/Puts pair with
+# one column per contract, "long" the per-day feature table plus one row per
+# contract (see pipeline.chain_tables)
+LAYOUT_SHEETS = {"wide": ["Calls", "Puts"], "long": ["Features", "Chain"]}
+
+
+def _draw_factors(rng, factor_ranges, draw_order, n_days):
+    factors = np.empty((n_days, len(factor_ranges)))
+    for j in draw_order:
+        low, high = factor_ranges[j]
+        factors[:, j] = rng.uniform(low, high, n_days)
+    return factors
+
+
+def simulate_days(n_days, initial_price, mu=0.0005, dt=1 / 252, min_annual_volatility=0.01,
+                  max_annual_volatility=0.4, windows=WINDOWS, rng=None):
+    """
+    Simulate a price history and draw the per-day contract parameters.
+
+    Draws from rng (a np.random.RandomState) in the order the original split
+    scripts used after np.random.seed(seed).
+
+    Returns a dict with close, rolling_stds (len(windows), n_days, NaN filled
+    with 0), call_factors and put_factors (n_days, 4) in MONEYNESS order, and
+    the per-day contract volatilities.
+    """
+    if rng is None:
+        rng = np.random.RandomState()
+
+    with phase("simulation", n_days):
+        # Geometric Brownian Motion with a random daily volatility
+        annual_volatilities = rng.uniform(min_annual_volatility, max_annual_volatility, n_days)
+        daily_returns = rng.normal(mu * dt, annual_volatilities / np.sqrt(252), n_days)
+        close = initial_price * np.exp(np.cumsum(daily_returns))
+
+    with phase("rolling volatility", n_days):
+        rolling_stds = np.nan_to_num(rolling_std(path_log_returns(close), windows), nan=0.0)
+
+    with phase("strike-factor sampling", n_days):
+        call_factors = _draw_factors(rng, CALL_STRIKE_FACTORS, CALL_DRAW_ORDER, n_days)
+        put_factors = _draw_factors(rng, PUT_STRIKE_FACTORS, PUT_DRAW_ORDER, n_days)
+        volatilities = rng.uniform(min_annual_volatility, max_annual_volatility, n_days)
+
+    return {
+        "close": close,
+        "rolling_stds": rolling_stds,
+        "call_factors": call_factors,
+        "put_factors": put_factors,
+        "volatilities": volatilities,
+    }
+
+
+def generate_split(n_days, initial_price, start_date, mu=0.0005, dt=1 / 252,
+                   min_annual_volatility=0.01, max_annual_volatility=0.4, r=0.05,
+                   expiration_days=30, windows=WINDOWS, seed=100, drop_days=90, greeks=False, layout="wide",
+                   feature_dtype=np.float64):
+    """
+    Simulate one price history and build its Calls and Puts frames.
+
+    Random numbers come from np.random.RandomState(seed) in the same order as
+    the original split scripts drew them after np.random.seed(seed), so the
+    output matches theirs exactly. The first drop_days days (the
+    rolling-window warm-up) are dropped.
+
+    greeks: add delta, gamma, vega, theta and rho columns per contract
+    layout: "wide" returns (calls_df, puts_df), "long" returns
+        (features_df, chain_df) as built by pipeline.chain_tables
+    feature_dtype: dtype of the volatility feature columns; np.float32
+        halves their memory and file size at about 7 significant digits
+    """
+    if layout not in LAYOUT_SHEETS:
+        raise ValueError(f"layout must be one of {sorted(LAYOUT_SHEETS)}")
+    days = simulate_days(n_days, initial_price, mu, dt, min_annual_volatility, max_annual_volatility,
+                         windows, np.random.RandomState(seed))
+    dates = pd.date_range(start=start_date, periods=n_days, freq="B")  # Business days
+
+    # Drop the rolling-window warm-up before pricing
+    kept = slice(drop_days, None)
+    build = option_frames if layout == "wide" else chain_tables
+    return build(dates[kept], days["close"][kept], days["rolling_stds"][:, kept], windows,
+                 days["volatilities"][kept], days["call_factors"][kept], days["put_factors"][kept],
+                 expiration_days, r, greeks, feature_dtype=feature_dtype)
+
+
+def split_params(split, output_format="parquet", greeks=False, seed=100, layout="wide", feature_dtype=np.float64):
+    """
+    Every parameter that determines the files of a split, as plain JSON
+    values: the generate_split defaults, the SPLITS entry, the strike-factor
+    ranges and the output options. Used as the dataset cache key.
+    """
+    params = {name: p.default for name, p in inspect.signature(generate_split).parameters.items()
+              if p.default is not inspect.Parameter.empty}
+    params.update(SPLITS[split])
+    params.update({
+        "windows": list(params["windows"]),
+        "seed": seed,
+        "greeks": greeks,
+        "layout": layout,
+        "feature_dtype": np.dtype(feature_dtype).name,
+        "call_strike_factors": CALL_STRIKE_FACTORS,
+        "put_strike_factors": PUT_STRIKE_FACTORS,
+        "output_format": output_format,
+    })
+    return params
+
+
+def split_paths(stem, output_format="parquet", layout="wide"):
+    """Files written for a split: one per sheet, or one workbook for xlsx."""
+    sheets = [None] if output_format == "xlsx" else LAYOUT_SHEETS[layout]
+    return [dataset_path(stem, sheet, output_format) for sheet in sheets]
+
+
+def build_split(split, out_dir=".", output_format="parquet", greeks=False, seed=100, layout="wide",
+                feature_dtype=np.float64, cache=True, force=False, cache_dir=None):
+    """
+    Generate one of SPLITS and write it to out_dir/<stem>.*, creating out_dir
+    if needed.
+
+    With cache, a split whose parameters (see split_params) and generator
+    code were built before is copied from the DatasetCache instead of being
+    generated again; force regenerates it and refreshes the cache entry.
+
+    Returns the two frames of the layout, e.g. (calls_df, puts_df).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    params = split_params(split, output_format, greeks, seed, layout, feature_dtype)
+    stem = os.path.join(out_dir, SPLITS[split]["stem"])
+    paths = split_paths(stem, output_format, layout)
+    if cache:
+        store = DatasetCache(cache_dir)
+        key = dataset_key(params)
+        with phase("cache lookup"):
+            hit = not force and store.restore(key, paths)
+        if hit:
+            for sheet in LAYOUT_SHEETS[layout]:
+                remove_segments(stem, sheet, output_format)
+            return tuple(read_dataset(stem, sheet, output_format=output_format) for sheet in LAYOUT_SHEETS[layout])
+
+    generate = {k: v for k, v in SPLITS[split].items() if k != "stem"}
+    frames = generate_split(**generate, seed=seed, greeks=greeks, layout=layout, feature_dtype=feature_dtype)
+
+    with phase("write", sum(len(df) for df in frames)):
+        write_dataset(stem, dict(zip(LAYOUT_SHEETS[layout], frames)), output_format)
+    if cache:
+        store.store(key, paths, params)
+    return frames
+
+
+def _build_task(task):
+    split, out_dir, output_format, greeks, seed, layout, feature_dtype, cache, force, cache_dir = task
+    # Pool workers may be reused, so only report the phases of this task
+    profiler.phases = {}
+    build_split(split, out_dir, output_format, greeks, seed, layout, feature_dtype, cache, force, cache_dir)
+    stem = os.path.join(out_dir, SPLITS[split]["stem"])
+    return split_paths(stem, output_format, layout), profiler.phases
+
+
+def build_splits(splits, out_dir=".", output_format="parquet", greeks=False, seed=100, workers=None,
+                 layout="wide", feature_dtype=np.float64, cache=True, force=False, cache_dir=None):
+    """
+    Generate several SPLITS at once, one worker process per split.
+
+    The wall time is that of the largest split. Phases recorded by the workers
+    are merged into the process-wide profiler when profiling is enabled.
+
+    Returns a dict of split -> list of written files.
+    """
+    tasks = [(split, out_dir, output_format, greeks, seed, layout, feature_dtype, cache, force, cache_dir)
+             for split in splits]
+    with ProcessPoolExecutor(max_workers=workers or len(tasks)) as pool:
+        results = list(pool.map(_build_task, tasks))
+
+    for _, phases in results:
+        profiler.merge(phases)
+    return {split: paths for split, (paths, _) in zip(splits, results)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate the synthetic train/validation/test option datasets.")
+    parser.add_argument("splits", nargs="*", metavar="SPLIT", help=f"any of {', '.join(SPLITS)} or all (default: all)")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--format", dest="output_format", choices=["parquet", "feather", "mmap", "xlsx"],
+                        default="parquet")
+    parser.add_argument("--greeks", action="store_true", help="add Greeks columns per contract")
+    parser.add_argument("--layout", choices=list(LAYOUT_SHEETS), default="wide",
+                        help="wide Calls/Puts sheets or a long Features/Chain pair")
+    parser.add_argument("--float32", action="store_true", help="store the volatility features as float32")
+    parser.add_argument("--seed", type=int, default=100)
+    parser.add_argument("--force", action="store_true", help="regenerate even if the dataset cache has the split")
+    parser.add_argument("--no-cache", dest="cache", action="store_false", help="neither read nor fill the cache")
+    parser.add_argument("--cache-dir", default=None, help="dataset cache location (default: $GIS_CACHE_DIR)")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: one per split)")
+    parser.add_argument("--profile", metavar="REPORT", help="write a per-phase profiling report (JSON) to REPORT")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable(args.profile)
+
+    unknown = set(args.splits) - {*SPLITS, "all"}
+    if unknown:
+        parser.error(f"unknown splits: {sorted(unknown)}")
+    splits = list(SPLITS) if not args.splits or "all" in args.splits else list(dict.fromkeys(args.splits))
+    files = build_splits(splits, args.out_dir, args.output_format, args.greeks, args.seed, args.workers,
+                         args.layout, np.float32 if args.float32 else np.float64, args.cache, args.force,
+                         args.cache_dir)
+    for split in splits:
+        print(f"{split}: " + ", ".join(files[split]))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+import argparse
+import json
+import os
+
+import numpy as np
+
+from gis_common.generator import SPLITS, simulate_days
+from gis_common.pipeline import MONEYNESS, WINDOWS, option_frames
+from gis_common.profiling import phase, profiler
+from gis_common.storage import write_dataset
+
+# Default train/validation/test share of the days after the warm-up
+SPLIT_FRACTIONS = {"train": 0.70, "val": 0.15, "test": 0.15}
+
+
+def history_fields(windows):
+    """Row names of the history array, in storage order."""
+    return [
+        "close",
+        *[f"rolling_std_{w}" for w in windows],
+        *[f"call_factor_{suffix}" for suffix in MONEYNESS],
+        *[f"put_factor_{suffix}" for suffix in MONEYNESS],
+        "volatility",
+    ]
+
+
+def simulate_history(stem, n_days, initial_price, start_date, mu=0.0005, dt=1 / 252,
+                     min_annual_volatility=0.01, max_annual_volatility=0.4, r=0.05,
+                     expiration_days=30, windows=WINDOWS, seed=100):
+    """
+    Simulate one long history and store it for memory-mapped access.
+
+    Writes <stem>.history.npy, a (len(history_fields(windows)), n_days)
+    float64 array holding every per-day input of option_frames, and
+    <stem>.history.json with the parameters needed to rebuild the frames.
+    Rolling volatilities are computed over the whole history, so a split
+    starting mid-history sees the returns that precede it.
+
+    Returns the History opened on the new files.
+    """
+    days = simulate_days(n_days, initial_price, mu, dt, min_annual_volatility, max_annual_volatility,
+                         windows, np.random.RandomState(seed))
+
+    fields = history_fields(windows)
+    data = np.lib.format.open_memmap(stem + ".history.npy", mode="w+", dtype=np.float64,
+                                     shape=(len(fields), n_days))
+    rows = np.vstack([days["close"], days["rolling_stds"], days["call_factors"].T, days["put_factors"].T,
+                      days["volatilities"]])
+    data[:] = rows
+    data.flush()
+    del data
+
+    meta = {
+        "n_days": n_days,
+        "initial_price": initial_price,
+        "start_date": start_date,
+        "mu": mu,
+        "dt": dt,
+        "min_annual_volatility": min_annual_volatility,
+        "max_annual_volatility": max_annual_volatility,
+        "r": r,
+        "expiration_days": expiration_days,
+        "windows": list(windows),
+        "seed": seed,
+        "fields": fields,
+    }
+    with open(stem + ".history.json", "w") as f:
+        json.dump(meta, f, indent=2)
+    return History(stem)
+
+
+class History:
+    """
+    A simulated history opened read-only through a memory map.
+
+    Any number of splits or folds can be cut from it as [start, stop) day
+    ranges; slicing only maps the pages of those days, and nothing is
+    simulated again.
+
+        history = History("synthetic_4")
+        calls_df, puts_df = history.frames(*split_ranges(history.n_days)["test"])
+    """
+
+    def __init__(self, stem):
+        with open(stem + ".history.json") as f:
+            self.meta = json.load(f)
+        self.data = np.load(stem + ".history.npy", mmap_mode="r")
+        self.windows = self.meta["windows"]
+        self.n_days = self.data.shape[1]
+        self._rows = {name: i for i, name in enumerate(self.meta["fields"])}
+        self._first_date = np.busday_offset(np.datetime64(self.meta["start_date"], "D"), 0, roll="forward")
+
+    def column(self, name, start=0, stop=None):
+        """View of one field over [start, stop) (no copy)."""
+        return self.data[self._rows[name], start:stop]
+
+    def dates(self, start=0, stop=None):
+        stop = self.n_days if stop is None else stop
+        return np.busday_offset(self._first_date, np.arange(start, stop))  # Business days
+
+    def frames(self, start=0, stop=None, greeks=False):
+        """Calls and Puts frames for the days in [start, stop)."""
+        stop = self.n_days if stop is None else stop
+        block = self.data[:, start:stop]
+        n_windows = len(self.windows)
+        factors = block[1 + n_windows:1 + n_windows + 2 * len(MONEYNESS)]
+        return option_frames(
+            self.dates(start, stop),
+            block[0],
+            block[1:1 + n_windows],
+            self.windows,
+            block[-1],
+            factors[:len(MONEYNESS)].T,
+            factors[len(MONEYNESS):].T,
+            self.meta["expiration_days"],
+            self.meta["r"],
+            greeks,
+        )
+
+
+def split_ranges(n_days, fractions=SPLIT_FRACTIONS, drop_days=90):
+    """
+    Consecutive, non-overlapping [start, stop) day ranges in the order of
+    fractions, covering the days after the drop_days warm-up.
+
+    The last range absorbs rounding, so the ranges always end at n_days.
+    """
+    usable = max(n_days - drop_days, 0)
+    ranges = {}
+    start = drop_days
+    names = list(fractions)
+    total = sum(fractions.values())
+    for i, name in enumerate(names):
+        stop = n_days if i == len(names) - 1 else start + int(round(usable * fractions[name] / total))
+        ranges[name] = (start, stop)
+        start = stop
+    return ranges
+
+
+def walk_forward_folds(n_days, n_folds, test_days, train_days=None, drop_days=90):
+    """
+    Walk-forward (train, test) day ranges for out-of-time evaluation.
+
+    The last n_folds * test_days days are cut into consecutive test blocks.
+    Each fold trains on the days before its test block: all of them after the
+    warm-up (expanding window), or only the last train_days (rolling window).
+    Returns a list of {"train": (start, stop), "test": (start, stop)}.
+    """
+    first_test = n_days - n_folds * test_days
+    if first_test <= drop_days:
+        raise ValueError("not enough days for the requested folds after the warm-up")
+    folds = []
+    for k in range(n_folds):
+        test_start = first_test + k * test_days
+        train_start = drop_days if train_days is None else max(drop_days, test_start - train_days)
+        folds.append({"train": (train_start, test_start), "test": (test_start, test_start + test_days)})
+    return folds
+
+
+def build_splits_from_history(stem, out_dir=".", fractions=SPLIT_FRACTIONS, output_format="parquet",
+                              greeks=False, drop_days=90):
+    """
+    Write one dataset per split, cut from the history stored at stem.
+
+    Splits named like SPLITS use the same output stems (e.g.
+    training_data_synthetic_4), so downstream readers need no changes.
+    Returns a dict of split -> list of written files.
+    """
+    history = History(stem)
+    os.makedirs(out_dir, exist_ok=True)
+    files = {}
+    for name, (start, stop) in split_ranges(history.n_days, fractions, drop_days).items():
+        calls_df, puts_df = history.frames(start, stop, greeks)
+        out_stem = os.path.join(out_dir, SPLITS[name]["stem"] if name in SPLITS else name)
+        with phase("write", len(calls_df) + len(puts_df)):
+            files[name] = write_dataset(out_stem, {"Calls": calls_df, "Puts": puts_df}, output_format)
+    return files
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Simulate one long history and cut train/validation/test splits from it.")
+    parser.add_argument("stem", help="history path without extension, e.g. synthetic_4")
+    parser.add_argument("--n-days", type=int, default=SPLITS["train"]["n_days"])
+    parser.add_argument("--initial-price", type=float, default=100)
+    parser.add_argument("--start-date", default="1930-01-01")
+    parser.add_argument("--seed", type=int, default=100)
+    parser.add_argument("--fractions", type=float, nargs=3, metavar=("TRAIN", "VAL", "TEST"),
+                        default=list(SPLIT_FRACTIONS.values()))
+    parser.add_argument("--folds", type=int, default=0, help="also print this many walk-forward folds")
+    parser.add_argument("--fold-days", type=int, default=252, help="test days per walk-forward fold")
+    parser.add_argument("--out-dir", default=".")
+    parser.add_argument("--format", dest="output_format", choices=["parquet", "feather", "mmap", "xlsx"],
+                        default="parquet")
+    parser.add_argument("--greeks", action="store_true", help="add Greeks columns per contract")
+    parser.add_argument("--profile", metavar="REPORT", help="write a per-phase profiling report (JSON) to REPORT")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable(args.profile)
+
+    simulate_history(args.stem, args.n_days, args.initial_price, args.start_date, seed=args.seed)
+    fractions = dict(zip(SPLIT_FRACTIONS, args.fractions))
+    files = build_splits_from_history(args.stem, args.out_dir, fractions, args.output_format, args.greeks)
+    for name, paths in files.items():
+        print(f"{name}: " + ", ".join(paths))
+    for k, fold in enumerate(walk_forward_folds(args.n_days, args.folds, args.fold_days) if args.folds else []):
+        print(f"fold {k}: train {fold['train']}, test {fold['test']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from gis_common.pipeline import CALL_STRIKE_FACTORS, PUT_STRIKE_FACTORS, WINDOWS, price_ladders
+from gis_common.storage import read_dataset
+from gis_common.volatility import RollingVolatility
+
+# Strike ladder repriced on every tick: the midpoint of each factor range
+# used by the generators, in MONEYNESS order
+LIVE_CALL_FACTORS = np.mean(CALL_STRIKE_FACTORS, axis=1)
+LIVE_PUT_FACTORS = np.mean(PUT_STRIKE_FACTORS, axis=1)
+
+
+class LatencyHistogram:
+    """
+    Fixed-size latency histogram with log-spaced buckets.
+
+    Recording a batch costs one searchsorted and one bincount, and memory
+    does not grow with the number of samples. Percentiles are reported as the
+    upper edge of the bucket they fall in (about 2% resolution), capped at
+    the largest recorded sample.
+    """
+
+    def __init__(self, low=1e-6, high=10.0, buckets=800):
+        self.edges = np.geomspace(low, high, buckets + 1)
+        self.counts = np.zeros(buckets + 2, dtype=np.int64)  # plus under- and overflow
+        self.max = 0.0
+
+    def record(self, seconds):
+        seconds = np.atleast_1d(seconds)
+        self.counts += np.bincount(np.searchsorted(self.edges, seconds), minlength=self.counts.size)
+        self.max = max(self.max, float(seconds.max()))
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def percentile(self, q):
+        if not self.count:
+            return float("nan")
+        k = int(np.searchsorted(np.cumsum(self.counts), q / 100 * self.count))
+        if k >= self.counts.size - 1:
+            return self.max
+        return min(float(self.edges[min(k, self.edges.size - 1)]), self.max)
+
+    def summary(self):
+        """Counts and percentiles in milliseconds."""
+        return {
+            "count": self.count,
+            **{f"p{q:g}_ms": self.percentile(q) * 1e3 for q in (50, 90, 99, 99.9)},
+            "max_ms": self.max * 1e3,
+        }
+
+
+class PricingService:
+    """
+    Consume price ticks, keep the rolling volatilities current and reprice a
+    strike ladder in micro-batches.
+
+    Ticks are (price, timestamp) pairs put on a bounded asyncio queue by
+    ingest(); when the queue is full, ingest() waits, which slows the feed
+    down instead of dropping ticks (backpressure). run() takes the first
+    waiting tick, then keeps collecting until batch_window seconds have passed
+    or max_batch ticks are in hand, updates a RollingVolatility per tick and
+    prices the whole batch with one broadcast Black-Scholes call.
+
+    Every batch is published to each subscriber queue as a dict of arrays:
+    price, rolling_std (n, len(windows)), call_prices and put_prices
+    (n, ladder size) and latency (seconds from ingestion to publication).
+    Subscriber queues are bounded too, so a slow subscriber throttles the
+    service. Tick-to-price latencies are recorded in self.latency.
+
+    Contracts are priced with the annualized rolling std of pricing_window
+    days, or default_volatility until that window is full.
+    """
+
+    def __init__(self, windows=WINDOWS, call_factors=LIVE_CALL_FACTORS, put_factors=LIVE_PUT_FACTORS,
+                 expiration_days=30, r=0.05, pricing_window=30, default_volatility=0.2,
+                 batch_window=0.0, max_batch=1024, queue_size=10_000):
+        self.estimator = RollingVolatility(windows)
+        self.windows = list(windows)
+        self.call_factors = np.asarray(call_factors, dtype=float)
+        self.put_factors = np.asarray(put_factors, dtype=float)
+        self.expiration_days = expiration_days
+        self.r = r
+        self.pricing_column = self.windows.index(pricing_window)
+        self.default_volatility = default_volatility
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.subscribers = []
+        self.latency = LatencyHistogram()
+        self.batch_sizes = []
+
+    def subscribe(self, maxsize=1_000):
+        """Return a new queue that receives every published batch (None after the last one)."""
+        queue = asyncio.Queue(maxsize=maxsize)
+        self.subscribers.append(queue)
+        return queue
+
+    async def ingest(self, price, timestamp=None):
+        await self.queue.put((price, time.perf_counter() if timestamp is None else timestamp))
+
+    async def close(self):
+        """Signal the end of the feed; run() returns once every queued tick is priced."""
+        await self.queue.put(None)
+
+    def _drain(self, batch):
+        while len(batch) < self.max_batch and not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        return batch
+
+    async def run(self):
+        loop = asyncio.get_running_loop()
+        done = False
+        while not done:
+            batch = self._drain([await self.queue.get()])
+            deadline = loop.time() + self.batch_window
+            # Sleep until the next tick or the end of the window, whichever comes first
+            while self.batch_window > 0 and len(batch) < self.max_batch and batch[-1] is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+                self._drain(batch)
+            if batch[-1] is None:
+                done = True
+                batch.pop()
+            if batch:
+                await self._publish(self._price_batch(batch))
+
+        for queue in self.subscribers:
+            await queue.put(None)
+
+    def _price_batch(self, batch):
+        prices = np.array([price for price, _ in batch])
+        stamps = np.array([stamp for _, stamp in batch])
+        rolling_stds = self.estimator.extend(prices).T
+
+        volatilities = rolling_stds[:, self.pricing_column] * np.sqrt(252)
+        volatilities = np.where(np.isnan(volatilities), self.default_volatility, volatilities)
+        _, (call_prices, put_prices), _ = price_ladders(prices, self.call_factors, self.put_factors, volatilities,
+                                                        self.expiration_days, self.r)
+        latency = time.perf_counter() - stamps
+        self.latency.record(latency)
+        self.batch_sizes.append(len(batch))
+        return {
+            "price": prices,
+            "rolling_std": rolling_stds,
+            "call_prices": call_prices,
+            "put_prices": put_prices,
+            "latency": latency,
+        }
+
+    async def _publish(self, result):
+        for queue in self.subscribers:
+            await queue.put(result)
+
+
+async def replay_feed(service, prices, rate=10_000):
+    """
+    Feed prices to the service at `rate` ticks per second, then close it.
+
+    Ticks are released in small bursts whenever the event loop gets control,
+    as many as are due by the wall clock, and each is stamped when it is
+    ingested.
+    """
+    start = time.perf_counter()
+    sent = 0
+    while sent < len(prices):
+        due = min(int((time.perf_counter() - start) * rate) + 1, len(prices))
+        while sent < due:
+            await service.ingest(float(prices[sent]))
+            sent += 1
+        await asyncio.sleep(0.0002)
+    await service.close()
+
+
+async def socket_feed(service, host="127.0.0.1", port=8765):
+    """
+    Stand-in for a market data socket: serve one connection that sends one
+    price per line, and close the service when it disconnects.
+    """
+    done = asyncio.Event()
+
+    async def handle(reader, writer):
+        async for line in reader:
+            if line.strip():
+                await service.ingest(float(line))
+        writer.close()
+        done.set()
+
+    server = await asyncio.start_server(handle, host, port)
+    async with server:
+        await done.wait()
+    await service.close()
+
+
+def replay_prices(stem, sheet_name="Calls"):
+    """Underlying prices of a generated dataset, to replay as a feed."""
+    return read_dataset(stem, sheet_name, columns=["Underlying Price"])["Underlying Price"].to_numpy()
+
+
+async def _count(queue):
+    batches = ticks = 0
+    while (result := await queue.get()) is not None:
+        batches += 1
+        ticks += len(result["price"])
+    return batches, ticks
+
+
+async def replay(prices, rate=10_000, batch_window=0.0, max_batch=1024, queue_size=10_000):
+    """Replay prices through a PricingService; returns a latency and throughput summary."""
+    service = PricingService(batch_window=batch_window, max_batch=max_batch, queue_size=queue_size)
+    subscriber = asyncio.create_task(_count(service.subscribe()))
+    start = time.perf_counter()
+    await asyncio.gather(replay_feed(service, prices, rate), service.run())
+    batches, ticks = await subscriber
+    elapsed = time.perf_counter() - start
+    return {
+        "ticks": ticks,
+        "batches": batches,
+        "mean_batch": ticks / batches if batches else 0.0,
+        "ticks_per_s": ticks / elapsed,
+        "latency": service.latency.summary(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a generated dataset through the live pricing service.")
+    parser.add_argument("stem", nargs="?", help="dataset to replay (default: a simulated path)")
+    parser.add_argument("--ticks", type=int, default=50_000, help="ticks to replay")
+    parser.add_argument("--rate", type=float, default=10_000, help="ticks per second")
+    parser.add_argument("--batch-window-ms", type=float, default=0.0,
+                        help="how long to keep collecting ticks after the first one of a batch")
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--queue-size", type=int, default=10_000)
+    args = parser.parse_args()
+
+    if args.stem:
+        prices = replay_prices(args.stem)
+    else:
+        rng = np.random.default_rng(100)
+        prices = 100 * np.exp(np.cumsum(rng.normal(0.0005 / 252, 0.2 / np.sqrt(252), args.ticks)))
+    prices = np.resize(prices, args.ticks)  # Repeat a short dataset to reach --ticks
+
+    summary = asyncio.run(replay(prices, args.rate, args.batch_window_ms / 1e3, args.max_batch, args.queue_size))
+    print(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    main()
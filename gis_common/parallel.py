@@ -0,0 +1,147 @@
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from gis_common.profiling import phase, profiler
+
+# Days drawn from one random stream. The path is cut into blocks of this size
+# whatever the number of workers, which is what keeps the output independent
+# of the worker count; changing it changes the path.
+BLOCK_DAYS = 1 << 20
+
+
+def block_streams(seed, block):
+    """
+    Generators of one block: (annual volatilities, return shocks).
+
+    Both are PCG64 streams of the root seed jumped ahead by 2 * block and
+    2 * block + 1, so any block can be drawn without drawing the ones before
+    it, and the streams never overlap.
+    """
+    root = np.random.PCG64(np.random.SeedSequence(seed))
+    return np.random.Generator(root.jumped(2 * block)), np.random.Generator(root.jumped(2 * block + 1))
+
+
+def _block_range(block, n_days):
+    return block * BLOCK_DAYS, min((block + 1) * BLOCK_DAYS, n_days)
+
+
+def _simulate_blocks(task):
+    """Pass 1: draw the daily log returns of a run of blocks and sum each block in place."""
+    path, n_days, blocks, seed, mu, dt, min_annual_volatility, max_annual_volatility = task
+    log_prices = np.load(path, mmap_mode="r+")
+    totals = []
+    for block in blocks:
+        start, stop = _block_range(block, n_days)
+        volatility_rng, return_rng = block_streams(seed, block)
+        # Geometric Brownian Motion with a random daily volatility
+        out = log_prices[start:stop]
+        out[:] = volatility_rng.uniform(min_annual_volatility, max_annual_volatility, stop - start)
+        out /= np.sqrt(252)
+        out *= return_rng.standard_normal(stop - start)
+        out += mu * dt
+        np.cumsum(out, out=out)
+        totals.append(float(out[-1]))
+    log_prices.flush()
+    return totals
+
+
+def _finish_blocks(task):
+    """Pass 2: add the log-price reached before each block and convert to prices."""
+    path, n_days, blocks, offsets, initial_price = task
+    log_prices = np.load(path, mmap_mode="r+")
+    for block, offset in zip(blocks, offsets):
+        start, stop = _block_range(block, n_days)
+        out = log_prices[start:stop]
+        out += offset
+        np.exp(out, out=out)
+        out *= initial_price
+    log_prices.flush()
+
+
+def simulate_close_parallel(n_days, initial_price, mu=0.0005, dt=1 / 252, min_annual_volatility=0.01,
+                            max_annual_volatility=0.4, seed=100, workers=None, path=None):
+    """
+    Simulate one long GBM closing-price path across several processes.
+
+    The days are cut into blocks of BLOCK_DAYS, each drawn from its own jumped
+    PCG64 streams (see block_streams). Workers take contiguous runs of blocks
+    and, in a first pass, draw the daily log returns and take their cumulative
+    sum within each block. The running log-price at the start of every block is
+    then one cumulative sum over the block totals, and a second parallel pass
+    adds it and exponentiates. Every block goes through the same operations
+    whatever the worker count, so the path is identical for any `workers`.
+
+    The prices are written to path (a .npy file, opened later with
+    np.load(path, mmap_mode="r")), which is how paths larger than memory are
+    produced; when path is None they go through a temporary file and are
+    returned in memory. Returns the array (memory-mapped when path is given).
+
+    The draws differ from simulate_days, which follows the legacy RandomState
+    order and runs on one core.
+    """
+    if n_days == 0:
+        if path:
+            np.lib.format.open_memmap(path, mode="w+", dtype=np.float64, shape=(0,)).flush()
+            return np.load(path, mmap_mode="r")
+        return np.empty(0)
+
+    workers = workers or os.cpu_count() or 1
+    n_blocks = -(-n_days // BLOCK_DAYS)
+    runs = [run.tolist() for run in np.array_split(np.arange(n_blocks), min(workers, n_blocks)) if run.size]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        out_path = path or os.path.join(tmp, "close.npy")
+        np.lib.format.open_memmap(out_path, mode="w+", dtype=np.float64, shape=(n_days,)).flush()
+
+        with ProcessPoolExecutor(max_workers=len(runs)) as pool:
+            with phase("simulation", n_days):
+                params = (seed, mu, dt, min_annual_volatility, max_annual_volatility)
+                totals = [t for run_totals in pool.map(_simulate_blocks, [(out_path, n_days, run, *params)
+                                                                          for run in runs])
+                          for t in run_totals]
+
+            with phase("prefix fix-up", n_days):
+                # Log-price reached before each block
+                offsets = np.concatenate(([0.0], np.cumsum(totals)[:-1]))
+                tasks = []
+                for run in runs:
+                    tasks.append((out_path, n_days, run, offsets[run].tolist(), initial_price))
+                list(pool.map(_finish_blocks, tasks))
+
+        if path:
+            return np.load(path, mmap_mode="r")
+        return np.load(out_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate one long price path across processes.")
+    parser.add_argument("n_days", type=int)
+    parser.add_argument("--initial-price", type=float, default=100)
+    parser.add_argument("--seed", type=int, default=100)
+    parser.add_argument("--workers", type=int, nargs="+", default=[os.cpu_count() or 1],
+                        help="worker counts to run; with several, the timings are compared")
+    parser.add_argument("--out", metavar="PATH", help="write the prices to this .npy file")
+    parser.add_argument("--profile", metavar="REPORT", help="write a per-phase profiling report (JSON) to REPORT")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable(args.profile)
+
+    reference = None
+    for workers in args.workers:
+        start = time.perf_counter()
+        close = simulate_close_parallel(args.n_days, args.initial_price, seed=args.seed, workers=workers,
+                                        path=args.out)
+        elapsed = time.perf_counter() - start
+        same = "" if reference is None else f", identical to {args.workers[0]} workers: {np.array_equal(close, reference)}"
+        print(f"{workers} workers: {elapsed:.2f} s, {args.n_days / elapsed / 1e6:.1f}M days/s{same}")
+        if reference is None:
+            reference = np.array(close) if len(args.workers) > 1 else close
+
+
+if __name__ == "__main__":
+    main()
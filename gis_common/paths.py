@@ -0,0 +1,77 @@
+import numpy as np
+import pandas as pd
+
+from gis_common.pipeline import CALL_STRIKE_FACTORS, PUT_STRIKE_FACTORS, WINDOWS, option_frames
+from gis_common.volatility import rolling_std
+
+
+def simulate_gbm_paths(n_paths, n_days, initial_price, mu=0.0005, dt=1 / 252,
+                       min_annual_volatility=0.01, max_annual_volatility=0.4, rng=None):
+    """
+    Simulate independent Geometric Brownian Motion paths in one vectorized call.
+
+    Like the split scripts, every path and day gets its own annualized
+    volatility drawn uniformly from [min_annual_volatility, max_annual_volatility).
+
+    rng: np.random.Generator or seed
+    Returns an (n_paths, n_days) matrix of closing prices.
+    """
+    rng = np.random.default_rng(rng)
+
+    # Daily volatilities, then returns and log-prices, all computed in place
+    prices = rng.uniform(min_annual_volatility, max_annual_volatility, (n_paths, n_days))
+    prices /= np.sqrt(252)
+    prices *= rng.standard_normal((n_paths, n_days))
+    prices += mu * dt
+    np.cumsum(prices, axis=1, out=prices)
+    np.exp(prices, out=prices)
+    prices *= initial_price
+    return prices
+
+
+def path_log_returns(prices):
+    """Log returns along the last axis; the first day of every path is NaN."""
+    log_returns = np.full(prices.shape, np.nan)
+    log_returns[..., 1:] = np.log(prices[..., 1:] / prices[..., :-1])
+    return log_returns
+
+
+def generate_path_frames(n_paths, n_days, initial_price, start_date, mu=0.0005, dt=1 / 252,
+                         min_annual_volatility=0.01, max_annual_volatility=0.4, r=0.05,
+                         expiration_days=30, windows=WINDOWS, seed=100, drop_days=90, greeks=False):
+    """
+    Build Calls and Puts frames from many independent paths.
+
+    Each path goes through the same rolling volatility and pricing steps as the
+    split scripts. Rows are ordered path by path and tagged with a "Path"
+    column; the first drop_days days of every path are dropped.
+    """
+    rng = np.random.default_rng(seed)
+    close = simulate_gbm_paths(n_paths, n_days, initial_price, mu, dt,
+                               min_annual_volatility, max_annual_volatility, rng)
+    rolling_stds = np.nan_to_num(rolling_std(path_log_returns(close), windows), nan=0.0)
+
+    call_low, call_high = np.array(CALL_STRIKE_FACTORS).T
+    put_low, put_high = np.array(PUT_STRIKE_FACTORS).T
+    call_factors = rng.uniform(call_low, call_high, (n_paths, n_days, len(call_low)))
+    put_factors = rng.uniform(put_low, put_high, (n_paths, n_days, len(put_low)))
+    volatilities = rng.uniform(min_annual_volatility, max_annual_volatility, (n_paths, n_days))
+
+    # Keep the post warm-up days and flatten (paths x days) into rows
+    kept = slice(drop_days, None)
+    n_kept = max(n_days - drop_days, 0)
+    dates = pd.date_range(start=start_date, periods=n_days, freq="B")[kept]  # Business days
+    calls_df, puts_df = option_frames(
+        np.tile(dates, n_paths),
+        close[:, kept].ravel(),
+        rolling_stds[:, :, kept].reshape(len(windows), -1),
+        windows,
+        volatilities[:, kept].ravel(),
+        call_factors[:, kept].reshape(-1, len(call_low)),
+        put_factors[:, kept].reshape(-1, len(put_low)),
+        expiration_days, r, greeks,
+    )
+    path_ids = np.repeat(np.arange(n_paths), n_kept)
+    calls_df.insert(0, "Path", path_ids)
+    puts_df.insert(0, "Path", path_ids)
+    return calls_df, puts_df
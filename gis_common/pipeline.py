@@ -0,0 +1,257 @@
+import numpy as np
+import pandas as pd
+
+from gis_common.pricing import black_scholes_chain, black_scholes_greeks, implied_volatility
+from gis_common.profiling import phase
+
+# Rolling volatility windows (in trading days)
+WINDOWS = [3, 9, 21, 30, 60, 90]
+
+# Strike factor ranges relative to the close, in output column order
+# (Strike_ITM_1, Strike_ITM_2, Strike_OTM_1, Strike_OTM_2)
+CALL_STRIKE_FACTORS = [(0.70, 0.80), (0.60, 0.70), (0.90, 0.99), (0.80, 0.90)]
+PUT_STRIKE_FACTORS = [(1.01, 1.10), (1.10, 1.20), (1.20, 1.30), (1.30, 1.40)]
+
+# Output column suffixes matching the strike factor columns
+MONEYNESS = ["ITM_1", "ITM_2", "OTM_1", "OTM_2"]
+
+# Values of the "Option Type" column of the long-format chain
+OPTION_TYPES = ["Call", "Put"]
+
+# Greeks added per contract when option_frames(..., greeks=True)
+GREEKS = ["delta", "gamma", "vega", "theta", "rho"]
+
+
+def annualized_std(rolling_stds, trading_days=252):
+    """Annualize daily rolling standard deviations."""
+    return rolling_stds * np.sqrt(trading_days)
+
+
+def nominal_volatility(annualized_stds, close, volatilities, out=None):
+    """<w>_Day_Volatility: annualized std scaled by the price and the contract volatility."""
+    return np.multiply(annualized_stds * close, volatilities, out=out)
+
+
+def percent_volatility(annualized_stds, window, trading_days=252, percent_scale=100, out=None):
+    """<w>_Day_Percent_Volatility: annualized std as a percentage over the window."""
+    return np.multiply(annualized_stds * percent_scale, np.sqrt(window / trading_days), out=out)
+
+
+def volatility_features(rolling_stds, windows, close, volatilities, dtype=np.float64):
+    """
+    Volatility feature columns shared by the Calls and Puts sheets.
+
+    rolling_stds: (len(windows), n_days) rolling std of log returns, NaN already filled
+    close: closing prices
+    volatilities: per-day contract volatility
+    dtype: storage dtype of the features (np.float32 halves their memory;
+        they are still computed in float64)
+
+    Returns a dict of column name -> row of one preallocated
+    (2 * len(windows), n_days) array. features.FeatureGraph evaluates the
+    same rules stage by stage.
+    """
+    close = np.asarray(close, dtype=float)
+    out = np.empty((2 * len(windows), close.size), dtype)
+    annualized_stds = annualized_std(rolling_stds)
+
+    for k, w in enumerate(windows):
+        nominal_volatility(annualized_stds[k], close, volatilities, out=out[k])
+        percent_volatility(annualized_stds[k], w, out=out[len(windows) + k])
+
+    names = [f"{w}_Day_Volatility" for w in windows] + [f"{w}_Day_Percent_Volatility" for w in windows]
+    return dict(zip(names, out))
+
+
+def price_ladders(close, call_factors, put_factors, volatilities, expiration_days, r, greeks=False):
+    """
+    Strikes and prices of every call and put of every day in one broadcast pass.
+
+    call_factors, put_factors: (n_days, n_strikes), or (n_strikes,) to use
+        the same ladder every day
+
+    Returns (strikes, prices, values): strikes and prices have shape
+    (2, n_days, n_strikes) with calls first, values maps each name in GREEKS
+    to an array of the same shape (empty unless greeks).
+    """
+    T = expiration_days / 365  # Convert days to years
+
+    call_strikes = close[:, None] * call_factors
+    put_strikes = close[:, None] * put_factors
+
+    args = (close[:, None], np.stack([call_strikes, put_strikes]), T, r, volatilities[:, None],
+            np.array([True, False])[:, None, None])
+    if greeks:
+        values = black_scholes_greeks(*args)
+        prices = values["price"]
+        values = {name: values[name] for name in GREEKS}
+    else:
+        values = {}
+        prices = black_scholes_chain(*args)
+    return args[1], prices, values
+
+
+def option_frames(dates, close, rolling_stds, windows, volatilities, call_factors, put_factors,
+                  expiration_days, r, greeks=False, feature_dtype=np.float64):
+    """
+    Price the daily call and put ladders and assemble the Calls and Puts frames.
+
+    call_factors, put_factors: (n_days, 4) strike factors in MONEYNESS order
+    expiration_days: days to expiration (converted to years with a 365-day year)
+    r: risk-free rate (annualized)
+    greeks: also add "Call Delta_ITM_1"-style columns for every name in GREEKS
+    feature_dtype: dtype of the volatility feature columns (e.g. np.float32)
+
+    Each sheet is filled column by column into preallocated arrays (one for
+    the features, one for the price and contract columns), and the frames
+    wrap those arrays without copying them.
+    """
+    close = np.asarray(close, dtype=float)
+
+    with phase("pricing", close.size):
+        strikes, prices, values = price_ladders(close, call_factors, put_factors, volatilities,
+                                                expiration_days, r, greeks)
+
+    with phase("frame build", close.size):
+        dates = np.asarray(dates)
+        features = volatility_features(rolling_stds, windows, close, volatilities, feature_dtype)
+
+        frames = []
+        for side, option in enumerate(OPTION_TYPES):
+            names = []
+            for suffix in MONEYNESS:
+                names += [f"Strike_{suffix}", f"{option} Price_{suffix}"]
+                names += [f"{option} {name.capitalize()}_{suffix}" for name in values]
+
+            contracts = np.empty((1 + len(names), close.size))
+            contracts[0] = close
+            rows = iter(contracts[1:])
+            for j in range(len(MONEYNESS)):
+                next(rows)[:] = strikes[side][:, j]
+                next(rows)[:] = prices[side][:, j]
+                for name in values:
+                    next(rows)[:] = values[name][side][:, j]
+
+            # The first sheet takes the feature arrays, the second a copy
+            sheet_features = features if side == 0 else {name: v.copy() for name, v in features.items()}
+            columns = {
+                "Date": dates,
+                "Underlying Price": contracts[0],
+                "Expiration Days": expiration_days,
+                **sheet_features,
+                **dict(zip(names, contracts[1:])),
+            }
+            frames.append(pd.DataFrame(columns, copy=False))
+
+    calls_df, puts_df = frames
+    return calls_df, puts_df
+
+
+def _long_chain(dates, strikes, prices, values, expiration_days, buckets):
+    """Flatten (2, n_days, n_strikes) ladders into chain rows ordered by date, option type and bucket."""
+    _, n_days, n_strikes = strikes.shape
+
+    def rows(a):
+        return np.asarray(a).transpose(1, 0, 2).ravel()
+
+    codes = np.arange(2 * n_days * n_strikes)
+    chain = {
+        "Date": np.repeat(np.asarray(dates), 2 * n_strikes),
+        "Option Type": pd.Categorical.from_codes(codes // n_strikes % 2, OPTION_TYPES),
+        "Moneyness": pd.Categorical.from_codes(codes % n_strikes, buckets),
+        "Expiration Days": np.broadcast_to(expiration_days, 2 * n_days * n_strikes),
+        "Strike": rows(strikes),
+        "Price": rows(prices),
+        **{name.capitalize(): rows(values[name]) for name in values},
+    }
+    return pd.DataFrame(chain)
+
+
+def chain_tables(dates, close, rolling_stds, windows, volatilities, call_factors, put_factors,
+                 expiration_days, r, greeks=False, buckets=None, feature_dtype=np.float64):
+    """
+    Long-format version of option_frames.
+
+    Returns (features_df, chain_df):
+    features_df: one row per day with Date, Underlying Price and the
+        volatility features, stored once instead of in both sheets
+    chain_df: one row per contract with Date, Option Type ("Call"/"Put"),
+        Moneyness, Expiration Days, Strike and Price (plus Delta ... Rho when
+        greeks); join it to features_df on Date
+
+    call_factors, put_factors: (n_days, n_strikes) strike factors; any number
+        of strikes per day is allowed
+    buckets: labels of the strike columns (default MONEYNESS for 4 strikes,
+        otherwise "K1", "K2", ...)
+    feature_dtype: dtype of the volatility feature columns (e.g. np.float32)
+    """
+    close = np.asarray(close, dtype=float)
+    n_strikes = call_factors.shape[1]
+    if buckets is None:
+        buckets = MONEYNESS if n_strikes == len(MONEYNESS) else [f"K{j + 1}" for j in range(n_strikes)]
+
+    with phase("pricing", close.size):
+        strikes, prices, values = price_ladders(close, call_factors, put_factors, volatilities,
+                                                 expiration_days, r, greeks)
+
+    with phase("frame build", close.size):
+        features_df = pd.DataFrame({
+            "Date": np.asarray(dates),
+            "Underlying Price": close,
+            **volatility_features(rolling_stds, windows, close, volatilities, feature_dtype),
+        }, copy=False)
+        chain_df = _long_chain(dates, strikes, prices, values, expiration_days, buckets)
+
+    return features_df, chain_df
+
+
+def wide_to_long(calls_df, puts_df):
+    """
+    Convert Calls and Puts frames from option_frames (or an existing wide
+    dataset) into the (features_df, chain_df) layout of chain_tables.
+    """
+    per_contract = [c for c in calls_df if c == "Expiration Days" or c.partition("_")[2] in MONEYNESS]
+    features_df = calls_df.drop(columns=per_contract)
+    names = [name for name in GREEKS if f"Call {name.capitalize()}_{MONEYNESS[0]}" in calls_df]
+
+    def ladder(prefix):
+        return np.stack([calls_df[[f"Call {prefix}_{s}" for s in MONEYNESS]].to_numpy(),
+                         puts_df[[f"Put {prefix}_{s}" for s in MONEYNESS]].to_numpy()])
+
+    strikes = np.stack([calls_df[[f"Strike_{s}" for s in MONEYNESS]].to_numpy(),
+                        puts_df[[f"Strike_{s}" for s in MONEYNESS]].to_numpy()])
+    values = {name: ladder(name.capitalize()) for name in names}
+    expiration_days = np.repeat(calls_df["Expiration Days"].to_numpy(), 2 * len(MONEYNESS))
+    chain_df = _long_chain(calls_df["Date"], strikes, ladder("Price"), values, expiration_days, MONEYNESS)
+    return features_df.reset_index(drop=True), chain_df
+
+
+def implied_volatility_columns(df, r, option="Call"):
+    """
+    Implied volatility of every "<option> Price_<suffix>" column of a Calls or
+    Puts frame, inverted in one vectorized call.
+
+    option: "Call" or "Put"
+    Returns a frame with "<option> IV_<suffix>" columns.
+    """
+    prices = df[[f"{option} Price_{suffix}" for suffix in MONEYNESS]].to_numpy()
+    strikes = df[[f"Strike_{suffix}" for suffix in MONEYNESS]].to_numpy()
+    S = df["Underlying Price"].to_numpy()[:, None]
+    T = df["Expiration Days"].to_numpy()[:, None] / 365  # Convert days to years
+
+    iv = implied_volatility(prices, S, strikes, T, r, option == "Call")
+    return pd.DataFrame({f"{option} IV_{suffix}": iv[:, j] for j, suffix in enumerate(MONEYNESS)}, index=df.index)
+
+
+def chain_implied_volatility(chain_df, features_df, r):
+    """
+    Implied volatility of every row of a long-format chain, inverted in one
+    vectorized call over all strikes and option types.
+
+    Returns a Series aligned with chain_df.
+    """
+    S = chain_df["Date"].map(features_df.set_index("Date")["Underlying Price"]).to_numpy()
+    T = chain_df["Expiration Days"].to_numpy() / 365  # Convert days to years
+    is_call = (chain_df["Option Type"] == "Call").to_numpy()
+    iv = implied_volatility(chain_df["Price"].to_numpy(), S, chain_df["Strike"].to_numpy(), T, r, is_call)
+    return pd.Series(iv, index=chain_df.index, name="IV")
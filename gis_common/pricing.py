@@ -0,0 +1,170 @@
+import numpy as np
+from scipy.special import ndtr
+
+
+def black_scholes_chain(S, K, T, r, sigma, is_call):
+    """
+    Vectorized Black-Scholes prices for a whole chain of calls and puts.
+
+    All arguments are broadcast against each other, so a single call can price
+    every strike of every day at once.
+
+    S: Stock price (current price of synthetic asset)
+    K: Strike price
+    T: Time to expiration (in years)
+    r: Risk-free interest rate (annualized)
+    sigma: Volatility (annualized)
+    is_call: True for call options, False for put options
+    """
+    S = np.asarray(S, dtype=float)
+    K = np.asarray(K, dtype=float)
+    d1, d2, sqrt_T = _d1_d2(S, K, T, r, sigma)
+
+    # Calls and puts share the same formula up to a sign flip:
+    # call = S N(d1) - K e^(-rT) N(d2),  put = K e^(-rT) N(-d2) - S N(-d1)
+    w = np.where(is_call, 1.0, -1.0)
+    return w * (S * ndtr(w * d1) - K * np.exp(-r * T) * ndtr(w * d2))
+
+
+def black_scholes_greeks(S, K, T, r, sigma, is_call):
+    """
+    Vectorized Black-Scholes price and Greeks for calls and puts.
+
+    Takes the same broadcast arguments as black_scholes_chain. d1/d2, the
+    normal density and the two normal CDFs are evaluated once per contract
+    and shared by every output.
+
+    Returns a dict of arrays:
+    price, delta, gamma, vega (per 1.00 of volatility),
+    theta (per year) and rho (per 1.00 of rate)
+    """
+    S = np.asarray(S, dtype=float)
+    K = np.asarray(K, dtype=float)
+    d1, d2, sqrt_T = _d1_d2(S, K, T, r, sigma)
+
+    w = np.where(is_call, 1.0, -1.0)
+    discounted_K = K * np.exp(-r * T)
+    cdf_d1 = ndtr(w * d1)
+    cdf_d2 = ndtr(w * d2)
+    pdf_d1 = np.exp(-0.5 * d1 * d1) / np.sqrt(2 * np.pi)
+
+    S_pdf = S * pdf_d1
+    return {
+        "price": w * (S * cdf_d1 - discounted_K * cdf_d2),
+        "delta": w * cdf_d1,
+        "gamma": pdf_d1 / (S * sigma * sqrt_T),
+        "vega": S_pdf * sqrt_T,
+        "theta": -S_pdf * sigma / (2 * sqrt_T) - w * r * discounted_K * cdf_d2,
+        "rho": w * T * discounted_K * cdf_d2,
+    }
+
+
+def _d1_d2(S, K, T, r, sigma):
+    sqrt_T = np.sqrt(T)
+    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * sqrt_T)
+    d2 = d1 - sigma * sqrt_T
+    return d1, d2, sqrt_T
+
+
+def black_scholes(S, K, T, r, sigma, option_type='call'):
+    """
+    S: Stock price (current price of synthetic asset)
+    K: Strike price
+    T: Time to expiration (in years)
+    r: Risk-free interest rate (annualized)
+    sigma: Volatility (annualized)
+    option_type: 'call' for call option, 'put' for put option
+
+    Accepts scalars or arrays; see black_scholes_chain for mixed calls and puts.
+    """
+    if option_type == 'call':
+        return black_scholes_chain(S, K, T, r, sigma, True)
+    elif option_type == 'put':
+        return black_scholes_chain(S, K, T, r, sigma, False)
+    else:
+        raise ValueError("option_type must be 'call' or 'put'")
+
+
+def implied_volatility(price, S, K, T, r, is_call, tol=1e-10, max_iter=40, sigma_bounds=(1e-6, 5.0)):
+    """
+    Vectorized Black-Scholes implied volatility for whole columns of quotes.
+
+    price: option prices; S, K, T, r, is_call as in black_scholes_chain
+    tol: convergence tolerance on sigma
+    sigma_bounds: search interval for sigma
+
+    Every quote is first mapped to its out-of-the-money side through put-call
+    parity, which keeps deep in-the-money quotes from losing precision. The
+    Corrado-Miller approximation gives the starting point, followed by
+    Halley steps kept inside a per-quote bracket. Wherever vega vanishes
+    (deep ITM/OTM) or a step leaves the bracket, that quote bisects instead.
+    Only unconverged quotes are carried into the next iteration.
+
+    Returns an array of implied volatilities; quotes outside the no-arbitrage
+    bounds get NaN.
+    """
+    price, S, K, T, r, is_call = np.broadcast_arrays(price, S, K, T, r, is_call)
+    shape = price.shape
+    price, S, K, T, r = (np.asarray(a, dtype=float).ravel() for a in (price, S, K, T, r))
+    w_in = np.where(np.asarray(is_call).ravel(), 1.0, -1.0)
+
+    X = K * np.exp(-r * T)
+    # Out-of-the-money side: call when the strike is above the forward, else put
+    w = np.where(X >= S, 1.0, -1.0)
+    target = price + 0.5 * (w - w_in) * (S - X)
+    upper = np.where(w > 0, S, X)
+
+    sigma_min, sigma_max = sigma_bounds
+    out = np.full(price.shape, np.nan)
+    valid = (target > 0) & (target < upper) & (T > 0)
+
+    # Corrado-Miller initial guess on the equivalent call price
+    call = target + (w < 0) * (S - X)
+    a = call - 0.5 * (S - X)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        guess = np.sqrt(2 * np.pi / T) / (S + X) * (a + np.sqrt(np.maximum(a * a - (S - X) ** 2 / np.pi, 0.0)))
+    guess = np.where(np.isfinite(guess) & (guess > 0), guess, 0.2)
+
+    idx = np.flatnonzero(valid)
+    sigma = np.clip(guess[idx], sigma_min, sigma_max)
+    lo = np.full(idx.size, sigma_min)
+    hi = np.full(idx.size, sigma_max)
+    S_, X_, w_ = S[idx], X[idx], w[idx]
+    log_moneyness = np.log(S_ / X_)
+    sqrt_T = np.sqrt(T[idx])
+    log_target = np.log(target[idx])
+
+    for _ in range(max_iter):
+        if idx.size == 0:
+            break
+        sigma_sqrt_T = sigma * sqrt_T
+        d1 = log_moneyness / sigma_sqrt_T + 0.5 * sigma_sqrt_T
+        d2 = d1 - sigma_sqrt_T
+        model = w_ * (S_ * ndtr(w_ * d1) - X_ * ndtr(w_ * d2))
+        vega = S_ * np.exp(-0.5 * d1 * d1) * (sqrt_T / np.sqrt(2 * np.pi))
+
+        with np.errstate(invalid="ignore", divide="ignore", over="ignore"):
+            # Solve in log-price space, which stays well scaled for deep OTM quotes
+            g = np.log(model) - log_target
+            step = g * model / vega
+            # Halley correction; vomma / vega = d1 d2 / sigma
+            curvature = d1 * d2 / sigma * model / vega - 1
+            new_sigma = sigma - step / (1 - 0.5 * step * curvature)
+
+        # Price increases with sigma, so the sign of g tightens the bracket
+        hi = np.where(g > 0, sigma, hi)
+        lo = np.where(g <= 0, sigma, lo)
+
+        bisect = ~np.isfinite(new_sigma) | (new_sigma < lo) | (new_sigma > hi)
+        done = (~bisect & (np.abs(new_sigma - sigma) <= tol)) | (g == 0) | (hi - lo <= tol)
+        new_sigma = np.where(bisect, 0.5 * (lo + hi), new_sigma)
+
+        out[idx[done]] = new_sigma[done]
+        keep = ~done
+        idx, sigma, lo, hi = idx[keep], new_sigma[keep], lo[keep], hi[keep]
+        S_, X_, w_ = S_[keep], X_[keep], w_[keep]
+        log_moneyness, sqrt_T, log_target = log_moneyness[keep], sqrt_T[keep], log_target[keep]
+
+    # Best estimate for quotes that ran out of iterations
+    out[idx] = sigma
+    return out.reshape(shape)
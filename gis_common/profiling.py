@@ -0,0 +1,100 @@
+import atexit
+import json
+import os
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+
+# Set to a report path (or "1" for DEFAULT_REPORT) to profile a generator run
+ENV_VAR = "GIS_PROFILE"
+DEFAULT_REPORT = "profile_report.json"
+
+_DISABLED = nullcontext()
+
+
+class Profiler:
+    """
+    Opt-in per-phase instrumentation for the generator pipeline.
+
+    Each phase records wall time, CPU time, rows/sec and the tracemalloc peak
+    above the memory in use when the phase started. Phases with the same name
+    (e.g. one per chunk) are accumulated. While disabled, phase() hands back a
+    shared no-op context manager, so instrumented code pays one attribute
+    check per phase.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.report_path = None
+        self.phases = {}
+        self._started = None
+
+    def enable(self, report_path=DEFAULT_REPORT):
+        """Start recording; the report is written to report_path at interpreter exit."""
+        if not self.enabled:
+            self.enabled = True
+            self._started = time.perf_counter()
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            atexit.register(self.write_report)
+        self.report_path = report_path
+
+    def phase(self, name, rows=None):
+        """Context manager timing one phase; rows is the number of rows it processed."""
+        if not self.enabled:
+            return _DISABLED
+        return self._measure(name, rows)
+
+    @contextmanager
+    def _measure(self, name, rows):
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall
+            cpu = time.process_time() - cpu
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+
+            stats = self.phases.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "rows": 0, "peak_mb": 0.0})
+            stats["calls"] += 1
+            stats["wall_s"] += wall
+            stats["cpu_s"] += cpu
+            stats["rows"] += rows or 0
+            stats["peak_mb"] = max(stats["peak_mb"], peak / 1e6)
+
+    def merge(self, phases):
+        """Fold phase records from another process (e.g. a pool worker) into this profiler."""
+        for name, other in phases.items():
+            stats = self.phases.setdefault(name, {"calls": 0, "wall_s": 0.0, "cpu_s": 0.0, "rows": 0, "peak_mb": 0.0})
+            for key in ("calls", "wall_s", "cpu_s", "rows"):
+                stats[key] += other[key]
+            stats["peak_mb"] = max(stats["peak_mb"], other["peak_mb"])
+
+    def report(self):
+        phases = []
+        for name, stats in self.phases.items():
+            rows_per_s = stats["rows"] / stats["wall_s"] if stats["rows"] and stats["wall_s"] > 0 else None
+            phases.append({"phase": name, **stats, "rows_per_s": rows_per_s})
+        total = time.perf_counter() - self._started if self._started is not None else 0.0
+        return {"total_wall_s": total, "phases": phases}
+
+    def write_report(self):
+        if not self.enabled or self.report_path is None:
+            return
+        with open(self.report_path, "w") as f:
+            json.dump(self.report(), f, indent=2)
+
+
+profiler = Profiler()
+
+
+def phase(name, rows=None):
+    """Time a phase with the process-wide profiler (a no-op unless profiling is enabled)."""
+    return profiler.phase(name, rows)
+
+
+_env_report = os.environ.get(ENV_VAR)
+if _env_report:
+    profiler.enable(DEFAULT_REPORT if _env_report == "1" else _env_report)
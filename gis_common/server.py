@@ -0,0 +1,220 @@
+import argparse
+import asyncio
+import json
+import time
+
+import numpy as np
+
+from gis_common.live import LatencyHistogram
+from gis_common.pricing import black_scholes_chain, black_scholes_greeks
+
+# Contract fields of a pricing request, broadcast against each other
+CONTRACT_FIELDS = ["S", "K", "T", "r", "sigma"]
+
+# HTTP reason phrases used in responses
+STATUS = {200: "200 OK", 400: "400 Bad Request", 404: "404 Not Found", 405: "405 Method Not Allowed",
+          500: "500 Internal Server Error"}
+
+
+def parse_contracts(payload):
+    """
+    Broadcast the fields of a request body into flat float arrays.
+
+    payload: {"S": ..., "K": ..., "T": ..., "r": ..., "sigma": ...,
+              "option_type": "call" | "put" | list of those}
+    where every field is a number or a list. T is in years.
+    Returns a dict of equal-length 1-D arrays, with a boolean is_call.
+    """
+    missing = [name for name in CONTRACT_FIELDS if name not in payload]
+    if missing:
+        raise ValueError(f"missing fields: {missing}")
+    option_type = np.asarray(payload.get("option_type", "call"))
+    if not np.isin(option_type, ["call", "put"]).all():
+        raise ValueError("option_type must be 'call' or 'put'")
+
+    values = [np.asarray(payload[name], dtype=float) for name in CONTRACT_FIELDS] + [option_type == "call"]
+    arrays = np.broadcast_arrays(*[np.atleast_1d(v) for v in values])
+    if arrays[0].ndim != 1:
+        raise ValueError("fields must be numbers or flat lists")
+    return {name: a for name, a in zip(CONTRACT_FIELDS + ["is_call"], arrays)}
+
+
+class _Request:
+    __slots__ = ("kind", "contracts", "future")
+
+    def __init__(self, kind, contracts, future):
+        self.kind = kind
+        self.contracts = contracts
+        self.future = future
+
+
+class PricingServer:
+    """
+    Local request/response pricing API that coalesces concurrent requests.
+
+    POST /price and POST /greeks take a JSON body as described in
+    parse_contracts and return {"price": [...]} or the price plus every Greek
+    (see pricing.black_scholes_greeks). GET /metrics returns the counters.
+
+    Requests are not priced one by one: they wait on a queue, and a single
+    batcher task gathers everything that arrives within batch_window seconds
+    of the first request (or until max_contracts contracts are waiting),
+    prices all contracts of the same kind with one vectorized call and hands
+    each request its slice of the result.
+
+    The server speaks a minimal HTTP/1.1 (Content-Length bodies, keep-alive)
+    over TCP on localhost or over a Unix socket.
+    """
+
+    def __init__(self, batch_window=0.002, max_contracts=100_000):
+        self.batch_window = batch_window
+        self.max_contracts = max_contracts
+        self.pending = None
+        self.started = time.perf_counter()
+        self.latency = LatencyHistogram()
+        self.counters = {"requests": 0, "contracts": 0, "batches": 0, "errors": 0}
+
+    def metrics(self):
+        elapsed = time.perf_counter() - self.started
+        batches = self.counters["batches"]
+        return {
+            **self.counters,
+            "uptime_s": elapsed,
+            "requests_per_s": self.counters["requests"] / elapsed,
+            "contracts_per_s": self.counters["contracts"] / elapsed,
+            "requests_per_batch": self.counters["requests"] / batches if batches else 0.0,
+            "latency": self.latency.summary(),
+        }
+
+    async def serve(self, host="127.0.0.1", port=8000, unix_path=None):
+        self.pending = asyncio.Queue()
+        batcher = asyncio.create_task(self._batch_loop())
+        if unix_path:
+            server = await asyncio.start_unix_server(self._handle, unix_path)
+        else:
+            server = await asyncio.start_server(self._handle, host, port)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+
+    async def price(self, kind, payload):
+        """Queue one request for the next batch and wait for its result."""
+        future = asyncio.get_running_loop().create_future()
+        await self.pending.put(_Request(kind, parse_contracts(payload), future))
+        return await future
+
+    async def _batch_loop(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.pending.get()]
+            contracts = batch[0].contracts["S"].size
+            deadline = loop.time() + self.batch_window
+            while contracts < self.max_contracts:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    request = await asyncio.wait_for(self.pending.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(request)
+                contracts += request.contracts["S"].size
+
+            for kind in ("price", "greeks"):
+                group = [request for request in batch if request.kind == kind]
+                if not group:
+                    continue
+                try:
+                    self._price_group(kind, group)
+                except Exception as error:
+                    # Fail this group's requests but keep serving the next batches
+                    for request in group:
+                        if not request.future.done():
+                            request.future.set_exception(error)
+            self.counters["batches"] += 1
+
+    def _price_group(self, kind, group):
+        fields = {name: np.concatenate([request.contracts[name] for request in group])
+                  for name in CONTRACT_FIELDS + ["is_call"]}
+        args = [fields[name] for name in CONTRACT_FIELDS] + [fields["is_call"]]
+        with np.errstate(all="ignore"):
+            values = black_scholes_greeks(*args) if kind == "greeks" else {"price": black_scholes_chain(*args)}
+
+        start = 0
+        for request in group:
+            stop = start + request.contracts["S"].size
+            if not request.future.done():
+                request.future.set_result({name: v[start:stop].tolist() for name, v in values.items()})
+            start = stop
+
+    async def _route(self, method, path, body):
+        if path == "/metrics":
+            return (200, self.metrics()) if method == "GET" else (405, {"error": "use GET"})
+        if path not in ("/price", "/greeks"):
+            return 404, {"error": f"unknown path {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+
+        received = time.perf_counter()
+        try:
+            payload = json.loads(body)
+            result = await self.price(path[1:], payload)
+        except (ValueError, TypeError) as error:
+            self.counters["errors"] += 1
+            return 400, {"error": str(error)}
+        except Exception as error:
+            self.counters["errors"] += 1
+            return 500, {"error": f"pricing failed: {type(error).__name__}"}
+        self.latency.record(time.perf_counter() - received)
+        self.counters["requests"] += 1
+        self.counters["contracts"] += len(result["price"])
+        return 200, result
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+
+                status, payload = await self._route(method, path, body)
+                data = json.dumps(payload).encode()
+                writer.write(f"HTTP/1.1 {STATUS[status]}\r\nContent-Type: application/json\r\n"
+                             f"Content-Length: {len(data)}\r\n\r\n".encode("latin-1") + data)
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve Black-Scholes prices and Greeks over local HTTP.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--batch-window-ms", type=float, default=2.0,
+                        help="how long to collect requests after the first one of a batch")
+    parser.add_argument("--max-contracts", type=int, default=100_000, help="contracts per batch before pricing early")
+    args = parser.parse_args()
+
+    server = PricingServer(args.batch_window_ms / 1e3, args.max_contracts)
+    print(f"Serving on {args.unix or f'http://{args.host}:{args.port}'}", flush=True)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
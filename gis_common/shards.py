@@ -0,0 +1,285 @@
+import argparse
+import hashlib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from gis_common.pipeline import WINDOWS
+from gis_common.storage import dataset_path
+from gis_common.streaming import STREAMS, advance_state, initial_state, run_chunks
+
+# Manifest of a sharded dataset, and the sidecar each generated shard writes
+MANIFEST = "manifest.json"
+SHARD_SUFFIX = ".shard.json"
+
+SHEETS = ["Calls", "Puts"]
+
+
+def shard_name(index):
+    return f"shard-{index:05d}"
+
+
+def file_checksum(path, block_size=1 << 20):
+    """SHA-256 of a file, read in blocks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(block_size):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def plan_shards(out_dir, n_days, shard_days, initial_price, start_date, mu=0.0005, dt=1 / 252,
+                min_annual_volatility=0.01, max_annual_volatility=0.4, r=0.05, expiration_days=30,
+                windows=WINDOWS, seed=100, drop_days=90, chunk_days=100_000, greeks=False):
+    """
+    Cut a generate_chunked run into date-range shards and write the manifest.
+
+    The path is simulated once without pricing (see streaming.advance_state)
+    to record the generation state at the first day of every shard: the
+    cumulative log-price, previous close, rolling-window tail and RNG states
+    of the STREAMS children of seed. With that state a shard can be generated
+    on any machine, in any order, from out_dir/manifest.json alone.
+
+    Row ranges count the written rows of a sheet, i.e. after the drop_days
+    warm-up, so shard i holds rows [row_start, row_stop) of the whole dataset.
+    Returns the manifest.
+    """
+    state = initial_state(initial_price, start_date, mu, dt, min_annual_volatility, max_annual_volatility, r,
+                          expiration_days, windows, seed, drop_days, "parquet", greeks)
+    shards = []
+    for index, day_start in enumerate(range(0, n_days, shard_days)):
+        day_stop = min(day_start + shard_days, n_days)
+        shards.append({
+            "index": index,
+            "name": shard_name(index),
+            "days": [day_start, day_stop],
+            "rows": [max(day_start - drop_days, 0), max(day_stop - drop_days, 0)],
+            "state": {k: v for k, v in state.items() if k != "params"},
+        })
+        if day_stop < n_days:
+            state = advance_state(state, day_stop - day_start, chunk_days)
+
+    manifest = {
+        "n_days": n_days,
+        "n_rows": max(n_days - drop_days, 0),
+        "shard_days": shard_days,
+        "chunk_days": chunk_days,
+        "sheets": SHEETS,
+        "params": state["params"],
+        "seed": {"root": seed, "streams": STREAMS},
+        "shards": shards,
+    }
+    os.makedirs(out_dir, exist_ok=True)
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def load_manifest(out_dir):
+    with open(os.path.join(out_dir, MANIFEST)) as f:
+        return json.load(f)
+
+
+def generate_shard(out_dir, index, manifest=None):
+    """
+    Generate one shard from the manifest and write its sidecar,
+    <name>.shard.json, describing the parameters, seed lineage, day and row
+    ranges and the checksum of every data file.
+
+    The same manifest always produces the same rows. Returns the sidecar.
+    """
+    manifest = manifest or load_manifest(out_dir)
+    shard = manifest["shards"][index]
+    stem = os.path.join(out_dir, shard["name"])
+    day_start, day_stop = shard["days"]
+    state = {"params": manifest["params"], **shard["state"]}
+    run_chunks(stem, state, day_stop - day_start, manifest["chunk_days"], mode="w")
+    os.remove(stem + ".state.json")  # the next shard's start state is in the manifest
+
+    files = {}
+    for sheet in manifest["sheets"] if shard["rows"][0] < shard["rows"][1] else []:
+        path = dataset_path(stem, sheet, "parquet")
+        files[sheet] = {"path": os.path.basename(path), "sha256": file_checksum(path)}
+    sidecar = {
+        **shard,
+        "params": manifest["params"],
+        "seed": manifest["seed"],
+        "chunk_days": manifest["chunk_days"],
+        "files": files,
+    }
+    with open(stem + SHARD_SUFFIX, "w") as f:
+        json.dump(sidecar, f, indent=2)
+    return sidecar
+
+
+def _generate_task(task):
+    out_dir, index = task
+    return generate_shard(out_dir, index)["name"]
+
+
+def generate_shards(out_dir, indices=None, workers=None):
+    """Generate the given shards (default: all) across a local process pool."""
+    manifest = load_manifest(out_dir)
+    indices = range(len(manifest["shards"])) if indices is None else indices
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_generate_task, [(out_dir, i) for i in indices]))
+
+
+def finalize(out_dir):
+    """
+    Copy the file checksums of every generated shard's sidecar into the
+    manifest, once all shards (possibly from several machines) are in out_dir.
+    Raises FileNotFoundError naming the shards that are still missing.
+    """
+    manifest = load_manifest(out_dir)
+    missing = []
+    for shard in manifest["shards"]:
+        sidecar_path = os.path.join(out_dir, shard["name"] + SHARD_SUFFIX)
+        if not os.path.exists(sidecar_path):
+            missing.append(shard["name"])
+            continue
+        with open(sidecar_path) as f:
+            shard["files"] = json.load(f)["files"]
+    if missing:
+        raise FileNotFoundError(f"shards not generated yet: {missing}")
+    with open(os.path.join(out_dir, MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+class ShardedDataset:
+    """
+    Lazy view of one sheet of a sharded dataset as a single table.
+
+    Nothing is read when the dataset is opened; iter_batches() streams one
+    Parquet row group at a time, shard after shard, and rows() reads only
+    the row groups that overlap the requested range.
+
+        dataset = ShardedDataset("corpus", "Calls")
+        for batch in dataset.iter_batches(["Date", "Call Price_ITM_1"]):
+            ...
+        df = dataset.rows(1_000_000, 1_010_000)
+    """
+
+    def __init__(self, out_dir, sheet_name="Calls"):
+        self.out_dir = out_dir
+        self.sheet_name = sheet_name
+        self.manifest = load_manifest(out_dir)
+        self.shards = self.manifest["shards"]
+        self._files = {}
+
+    def __len__(self):
+        return self.manifest["n_rows"]
+
+    def _file(self, shard):
+        import pyarrow.parquet as pq
+
+        name = shard["name"]
+        if name not in self._files:
+            path = os.path.join(self.out_dir, dataset_path(name, self.sheet_name, "parquet"))
+            self._files[name] = pq.ParquetFile(path)
+        return self._files[name]
+
+    def iter_batches(self, columns=None):
+        """Yield DataFrames of one row group each, in row order."""
+        for shard in self.shards:
+            if shard["rows"][0] == shard["rows"][1]:
+                continue  # only warm-up days
+            parquet = self._file(shard)
+            for group in range(parquet.num_row_groups):
+                yield parquet.read_row_group(group, columns=columns).to_pandas()
+
+    def rows(self, start, stop, columns=None):
+        """DataFrame of dataset rows [start, stop)."""
+        frames = []
+        for shard in self.shards:
+            row_start, row_stop = shard["rows"]
+            if row_stop <= start or row_start >= stop or row_start == row_stop:
+                continue
+            parquet = self._file(shard)
+            group_start = row_start
+            for group in range(parquet.num_row_groups):
+                group_stop = group_start + parquet.metadata.row_group(group).num_rows
+                if group_stop > start and group_start < stop:
+                    df = parquet.read_row_group(group, columns=columns).to_pandas()
+                    frames.append(df.iloc[max(start - group_start, 0):min(stop, group_stop) - group_start])
+                group_start = group_stop
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def verify(self):
+        """
+        Check every shard file against its checksum: the manifest's once
+        finalized, else the one in the shard's sidecar.
+
+        Returns (mismatched, unchecked) shard names; a shard is unchecked when
+        it has rows but neither the manifest nor a sidecar records a checksum.
+        """
+        mismatched, unchecked = [], []
+        for shard in self.shards:
+            if shard["rows"][0] == shard["rows"][1]:
+                continue  # only warm-up days, no files
+            entry = self._checksums(shard).get(self.sheet_name)
+            if entry is None:
+                unchecked.append(shard["name"])
+                continue
+            path = os.path.join(self.out_dir, entry["path"])
+            if not os.path.exists(path) or file_checksum(path) != entry["sha256"]:
+                mismatched.append(shard["name"])
+        return mismatched, unchecked
+
+    def _checksums(self, shard):
+        if "files" in shard:
+            return shard["files"]
+        try:
+            with open(os.path.join(self.out_dir, shard["name"] + SHARD_SUFFIX)) as f:
+                return json.load(f)["files"]
+        except FileNotFoundError:
+            return {}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plan, generate and check a sharded synthetic option dataset.")
+    parser.add_argument("command", choices=["plan", "generate", "finalize", "verify"])
+    parser.add_argument("out_dir")
+    parser.add_argument("--n-days", type=int, default=15090)
+    parser.add_argument("--shard-days", type=int, default=1_000_000)
+    parser.add_argument("--chunk-days", type=int, default=100_000)
+    parser.add_argument("--initial-price", type=float, default=100)
+    parser.add_argument("--start-date", default="1930-01-01")
+    parser.add_argument("--seed", type=int, default=100)
+    parser.add_argument("--greeks", action="store_true", help="add Greeks columns per contract")
+    parser.add_argument("--shards", type=int, nargs="+", metavar="INDEX",
+                        help="shards to generate on this machine (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    args = parser.parse_args()
+
+    if args.command == "plan":
+        manifest = plan_shards(args.out_dir, args.n_days, args.shard_days, args.initial_price, args.start_date,
+                               seed=args.seed, chunk_days=args.chunk_days, greeks=args.greeks)
+        print(f"Planned {len(manifest['shards'])} shards in {args.out_dir}")
+    elif args.command == "generate":
+        for name in generate_shards(args.out_dir, args.shards, args.workers):
+            print(name)
+    elif args.command == "finalize":
+        manifest = finalize(args.out_dir)
+        print(f"{len(manifest['shards'])} shards, {manifest['n_rows']} rows per sheet")
+    else:
+        mismatched, unchecked = set(), set()
+        for sheet in SHEETS:
+            sheet_mismatched, sheet_unchecked = ShardedDataset(args.out_dir, sheet).verify()
+            mismatched.update(sheet_mismatched)
+            unchecked.update(sheet_unchecked)
+        if mismatched:
+            print(f"checksum mismatch: {sorted(mismatched)}")
+        if unchecked:
+            print(f"no checksum recorded (not generated yet?): {sorted(unchecked)}")
+        if not mismatched and not unchecked:
+            print("all shards match their checksums")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+import glob
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+# File extension for every supported output format. Parquet and Feather
+# (Arrow IPC) are columnar, compressed and keep column dtypes; "mmap" is an
+# uncompressed directory of .npy column files that readers memory-map (see
+# ColumnStore); xlsx is kept as an optional export for spreadsheet users.
+FORMATS = {
+    "parquet": ".parquet",
+    "feather": ".feather",
+    "mmap": ".cols",
+    "xlsx": ".xlsx",
+}
+
+# Order in which read_dataset prefers formats written at the same time
+READ_PREFERENCE = ["mmap", "parquet", "feather", "xlsx"]
+
+# Schema file inside a memory-mapped column store
+STORE_MANIFEST = "manifest.json"
+
+# Columnar copies of xlsx sheets are cached next to the workbook, in
+# <workbook>.xlsx-cache/<sheet>.parquet, with the key of the workbook they
+# were converted from in XLSX_CACHE_KEY
+XLSX_CACHE_SUFFIX = "-cache"
+XLSX_CACHE_KEY = "key.json"
+
+
+def dataset_path(stem, sheet_name, output_format):
+    """
+    Path of one sheet of a dataset.
+
+    Columnar formats store one file per sheet, e.g.
+    training_data_synthetic_4.Calls.parquet; xlsx keeps every sheet in
+    training_data_synthetic_4.xlsx.
+    """
+    if output_format not in FORMATS:
+        raise ValueError(f"output_format must be one of {sorted(FORMATS)}")
+    if output_format == "xlsx":
+        return stem + FORMATS["xlsx"]
+    return f"{stem}.{sheet_name}{FORMATS[output_format]}"
+
+
+def write_dataset(stem, sheets, output_format="parquet"):
+    """
+    stem: output path without extension, e.g. "training_data_synthetic_4"
+    sheets: dict of sheet name -> DataFrame, e.g. {"Calls": calls_df, "Puts": puts_df}
+    output_format: "parquet", "feather", "mmap" (a .cols directory of .npy columns) or "xlsx"
+
+    Returns the list of written files.
+    """
+    if output_format == "xlsx":
+        path = dataset_path(stem, None, "xlsx")
+        with pd.ExcelWriter(path) as writer:
+            for sheet_name, df in sheets.items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return [path]
+
+    paths = []
+    for sheet_name, df in sheets.items():
+        path = dataset_path(stem, sheet_name, output_format)
+        remove_segments(stem, sheet_name, output_format)
+        if output_format == "mmap":
+            write_store(path, df)
+        elif output_format == "parquet":
+            df.to_parquet(path, compression="zstd", index=False)
+        else:
+            df.reset_index(drop=True).to_feather(path, compression="zstd")
+        paths.append(path)
+    return paths
+
+
+def segment_paths(stem, sheet_name, output_format):
+    """
+    Files holding one sheet of a columnar dataset, in row order: the base
+    file followed by any segments added by DatasetAppender(..., mode="a"),
+    e.g. training_data_synthetic_4.Calls.parquet,
+    training_data_synthetic_4.Calls.seg-0001.parquet, ...
+    """
+    base = dataset_path(stem, sheet_name, output_format)
+    segments = sorted(glob.glob(glob.escape(f"{stem}.{sheet_name}.seg-") + "[0-9]*" + FORMATS[output_format]))
+    return [base, *segments]
+
+
+def remove_segments(stem, sheet_name, output_format):
+    """
+    Delete the appended segments of one sheet, keeping its base file.
+
+    Anything that replaces a base file must call this, or the segments of
+    the earlier dataset would be read back after the new rows.
+    """
+    if output_format == "xlsx":
+        return
+    for segment in segment_paths(stem, sheet_name, output_format)[1:]:
+        os.remove(segment)
+
+
+def find_format(stem, sheet_name):
+    """
+    Return the most recently written format that exists on disk for this
+    sheet, so a dataset regenerated in another format is not hidden by an
+    older one. Formats with the same mtime are ranked by READ_PREFERENCE.
+    """
+    found = [(os.path.getmtime(dataset_path(stem, sheet_name, output_format)), -rank, output_format)
+             for rank, output_format in enumerate(READ_PREFERENCE)
+             if os.path.exists(dataset_path(stem, sheet_name, output_format))]
+    if not found:
+        raise FileNotFoundError(f"No dataset found for {stem!r} (sheet {sheet_name!r})")
+    return max(found)[2]
+
+
+def read_dataset(stem, sheet_name="Calls", columns=None, output_format=None):
+    """
+    stem: dataset path without extension (a legacy .xlsx path is also accepted)
+    sheet_name: "Calls" or "Puts"
+    columns: optional list of columns to load
+    output_format: format to read; by default the newest one on disk (see find_format)
+
+    Returns a DataFrame, like pd.read_excel(path, sheet_name=...).
+    """
+    if stem.endswith(FORMATS["xlsx"]):
+        stem = stem[:-len(FORMATS["xlsx"])]
+    if output_format is None:
+        output_format = find_format(stem, sheet_name)
+
+    if output_format == "xlsx":
+        return read_xlsx_cached(dataset_path(stem, sheet_name, "xlsx"), sheet_name, columns)
+    if output_format == "mmap":
+        return ColumnStore(dataset_path(stem, sheet_name, "mmap")).frame(columns)
+
+    read = pd.read_parquet if output_format == "parquet" else pd.read_feather
+    frames = [read(path, columns=columns) for path in segment_paths(stem, sheet_name, output_format)]
+    return frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+
+
+def xlsx_cache_key(path, known=None):
+    """
+    Key identifying the contents of a workbook: its size, mtime and SHA-256.
+
+    When known (an earlier key) has the same size and mtime, the file is not
+    hashed again and known is returned.
+    """
+    info = os.stat(path)
+    if known and known["size"] == info.st_size and known["mtime_ns"] == info.st_mtime_ns:
+        return known
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while block := f.read(1 << 20):
+            digest.update(block)
+    return {"size": info.st_size, "mtime_ns": info.st_mtime_ns, "sha256": digest.hexdigest()}
+
+
+def read_xlsx_cached(path, sheet_name, columns=None):
+    """
+    pd.read_excel(path, sheet_name=sheet_name, usecols=columns), served from a
+    Parquet sidecar after the first read.
+
+    The first read of a sheet parses it once and stores it in
+    <path>-cache/<sheet_name>.parquet; later reads load only the requested
+    columns from there. The sidecar is tied to the workbook's size, mtime and
+    SHA-256: a workbook that was only touched (same hash) keeps its cache,
+    one whose contents changed is converted again. When the cache directory
+    cannot be written, the workbook is read directly.
+    """
+    cache_dir = path + XLSX_CACHE_SUFFIX
+    key_path = os.path.join(cache_dir, XLSX_CACHE_KEY)
+    sheet_path = os.path.join(cache_dir, f"{sheet_name}.parquet")
+
+    known = None
+    if os.path.exists(key_path):
+        with open(key_path) as f:
+            known = json.load(f)
+    key = xlsx_cache_key(path, known)
+    if known is not None and key["sha256"] != known["sha256"]:
+        shutil.rmtree(cache_dir)  # The workbook changed: drop every cached sheet
+    if os.path.exists(sheet_path):
+        if key is not known:
+            _write_cache_key(key_path, key)  # Same contents, new mtime
+        return pd.read_parquet(sheet_path, columns=columns)
+
+    df = pd.read_excel(path, sheet_name=sheet_name)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        df.to_parquet(sheet_path + ".tmp", compression="zstd", index=False)
+        os.replace(sheet_path + ".tmp", sheet_path)
+        _write_cache_key(key_path, key)
+    except OSError:
+        pass  # Read-only location: serve this read without a cache
+    return df if columns is None else df[list(columns)]
+
+
+def _write_cache_key(key_path, key):
+    with open(key_path + ".tmp", "w") as f:
+        json.dump(key, f, indent=2)
+    os.replace(key_path + ".tmp", key_path)
+
+
+class DatasetAppender:
+    """
+    Append frames to a columnar dataset chunk by chunk.
+
+    Each append() adds one Parquet row group / Arrow record batch per sheet,
+    so a dataset can be written without ever holding it in memory.
+
+    mode="a" extends an existing dataset: its files are left untouched and
+    the new rows go to the next segment file (see segment_paths), which
+    read_dataset concatenates after the existing ones. A sheet with no base
+    file yet (e.g. a run that only covered the warm-up) starts one.
+
+        with DatasetAppender("training_data_synthetic_4") as out:
+            for calls_df, puts_df in chunks:
+                out.append({"Calls": calls_df, "Puts": puts_df})
+    """
+
+    def __init__(self, stem, output_format="parquet", mode="w"):
+        if output_format not in ("parquet", "feather"):
+            raise ValueError("appending requires a columnar output_format ('parquet' or 'feather')")
+        if mode not in ("w", "a"):
+            raise ValueError("mode must be 'w' or 'a'")
+        self.stem = stem
+        self.output_format = output_format
+        self.mode = mode
+        self.paths = []
+        self._writers = {}
+
+    def append(self, sheets):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        for sheet_name, df in sheets.items():
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            writer = self._writers.get(sheet_name)
+            if writer is None:
+                path = self._new_path(sheet_name)
+                if self.output_format == "parquet":
+                    writer = pq.ParquetWriter(path, table.schema, compression="zstd")
+                else:
+                    options = pa.ipc.IpcWriteOptions(compression="zstd")
+                    writer = pa.ipc.new_file(path, table.schema, options=options)
+                self._writers[sheet_name] = writer
+                self.paths.append(path)
+            writer.write_table(table)
+
+    def _new_path(self, sheet_name):
+        path = dataset_path(self.stem, sheet_name, self.output_format)
+        if self.mode == "w" or not os.path.exists(path):
+            remove_segments(self.stem, sheet_name, self.output_format)
+            return path
+        index = len(segment_paths(self.stem, sheet_name, self.output_format))
+        return f"{self.stem}.{sheet_name}.seg-{index:04d}{FORMATS[self.output_format]}"
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def write_store(path, df):
+    """
+    Write df as a memory-mappable column store: one fixed-dtype .npy file per
+    column in the directory path, plus a manifest with the schema.
+
+    Categorical columns are stored as integer codes with their categories in
+    the manifest. Columns with Python objects (e.g. strings) are not supported.
+
+    The store is built in a temporary directory and then swapped in, so
+    processes that still map an older version keep valid (unlinked) files.
+    """
+    final_path, path = path, path + ".tmp"
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path)
+    columns = []
+    for i, name in enumerate(df.columns):
+        values = df[name]
+        entry = {"name": name, "file": f"{i:03d}.npy"}
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            entry["categories"] = values.cat.categories.tolist()
+            array = values.cat.codes.to_numpy()
+        else:
+            array = values.to_numpy()
+        if array.dtype == object:
+            raise TypeError(f"column {name!r} holds Python objects and cannot be memory-mapped")
+        entry["dtype"] = array.dtype.str
+        np.save(os.path.join(path, entry["file"]), array)
+        columns.append(entry)
+
+    manifest = {"n_rows": len(df), "columns": columns}
+    if "Date" in df and df["Date"].is_monotonic_increasing:
+        manifest["sorted_by"] = "Date"
+    with open(os.path.join(path, STORE_MANIFEST), "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    if os.path.exists(final_path):
+        os.rename(final_path, final_path + ".old")
+        os.rename(path, final_path)
+        shutil.rmtree(final_path + ".old")
+    else:
+        os.rename(path, final_path)
+
+
+class ColumnStore:
+    """
+    Read-only, memory-mapped view of a column store written by write_store.
+
+    Columns are opened with np.load(mmap_mode="r"), so only the pages that
+    are touched are read, and every process opening the same store shares
+    them through the page cache instead of holding a private copy.
+
+        store = ColumnStore("training_data_synthetic_4.Calls.cols")
+        prices = store.column("Call Price_ITM_1")            # np.memmap, no copy
+        rows = store.rows_between("1990-01-01", "1990-12-31")
+        df = store.frame(["Date", "Call Price_ITM_1"], rows)  # only that year
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, STORE_MANIFEST)) as f:
+            self.manifest = json.load(f)
+        self._entries = {entry["name"]: entry for entry in self.manifest["columns"]}
+        self._arrays = {}
+
+    @property
+    def columns(self):
+        return [entry["name"] for entry in self.manifest["columns"]]
+
+    def __len__(self):
+        return self.manifest["n_rows"]
+
+    def column(self, name, rows=slice(None)):
+        """Stored values of one column (codes for categoricals) as a read-only memmap view."""
+        if name not in self._arrays:
+            self._arrays[name] = np.load(os.path.join(self.path, self._entries[name]["file"]), mmap_mode="r")
+        return self._arrays[name][rows]
+
+    def rows_between(self, start=None, end=None):
+        """Slice of the rows whose Date lies in [start, end]; needs a store sorted by Date."""
+        if self.manifest.get("sorted_by") != "Date":
+            raise ValueError("date slicing needs a store sorted by Date")
+        dates = self.column("Date")
+        lo = 0 if start is None else int(np.searchsorted(dates, np.datetime64(start), side="left"))
+        hi = len(self) if end is None else int(np.searchsorted(dates, np.datetime64(end), side="right"))
+        return slice(lo, hi)
+
+    def frame(self, columns=None, rows=slice(None)):
+        """
+        DataFrame of the given columns and rows. Numeric and date columns
+        wrap the memmap views without copying (they are read-only).
+        """
+        data = {}
+        for name in self.columns if columns is None else columns:
+            values = self.column(name, rows)
+            categories = self._entries[name].get("categories")
+            data[name] = pd.Categorical.from_codes(values, categories) if categories is not None else values
+        return pd.DataFrame(data, copy=False)
@@ -0,0 +1,246 @@
+import argparse
+import json
+
+import numpy as np
+
+from gis_common.pipeline import CALL_STRIKE_FACTORS, PUT_STRIKE_FACTORS, WINDOWS, option_frames
+from gis_common.profiling import phase, profiler
+from gis_common.storage import DatasetAppender
+from gis_common.volatility import rolling_std
+
+# Every random quantity gets its own stream, so the values drawn for a given
+# day do not depend on how the run is split into chunks.
+STREAMS = ["annual_volatility", "returns", "call_factors", "put_factors", "contract_volatility"]
+
+
+def child_seeds(seed, n):
+    """
+    The first n children of seed (an integer or np.random.SeedSequence).
+
+    Equivalent to SeedSequence.spawn(n) on a fresh sequence, but never
+    mutates seed, so the same children come back on every call.
+    """
+    if not isinstance(seed, np.random.SeedSequence):
+        seed = np.random.SeedSequence(seed)
+    return [np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (i,)) for i in range(n)]
+
+
+def state_path(stem):
+    """Sidecar file holding what is needed to extend a chunked dataset."""
+    return stem + ".state.json"
+
+
+def generate_chunked(stem, n_days, initial_price, start_date, mu=0.0005, dt=1 / 252,
+                     min_annual_volatility=0.01, max_annual_volatility=0.4, r=0.05,
+                     expiration_days=30, windows=WINDOWS, seed=100, drop_days=90,
+                     chunk_days=100_000, output_format="parquet", greeks=False):
+    """
+    Generate a dataset block by block with bounded memory.
+
+    The GBM path, rolling volatilities and option prices are produced for
+    chunk_days days at a time and appended to the output files. The
+    cumulative log-price, the previous close and the returns still inside the
+    longest rolling window carry over between chunks, so peak memory depends
+    on chunk_days only, not on n_days. The same tail state and the RNG states
+    are saved to <stem>.state.json, from which extend_chunked() continues the
+    history later.
+
+    The first drop_days days (the rolling-window warm-up) are not written.
+    seed: integer seed or np.random.SeedSequence
+    greeks: add delta, gamma, vega, theta and rho columns per contract
+    Returns the list of written files.
+    """
+    state = initial_state(initial_price, start_date, mu, dt, min_annual_volatility, max_annual_volatility, r,
+                          expiration_days, windows, seed, drop_days, output_format, greeks)
+    return run_chunks(stem, state, n_days, chunk_days, mode="w")
+
+
+def initial_state(initial_price, start_date, mu=0.0005, dt=1 / 252, min_annual_volatility=0.01,
+                  max_annual_volatility=0.4, r=0.05, expiration_days=30, windows=WINDOWS, seed=100,
+                  drop_days=90, output_format="parquet", greeks=False):
+    """Generation state of day 0: the parameters, an empty tail and fresh RNG streams."""
+    rngs = [np.random.default_rng(s) for s in child_seeds(seed, len(STREAMS))]
+    return {
+        "params": {
+            "initial_price": initial_price,
+            "start_date": str(start_date),
+            "mu": mu,
+            "dt": dt,
+            "min_annual_volatility": min_annual_volatility,
+            "max_annual_volatility": max_annual_volatility,
+            "r": r,
+            "expiration_days": expiration_days,
+            "windows": list(windows),
+            "drop_days": drop_days,
+            "output_format": output_format,
+            "greeks": greeks,
+        },
+        "n_days": 0,
+        "log_price": 0.0,
+        "previous_close": None,
+        "tail_returns": [],
+        "rng_states": {name: rng.bit_generator.state for name, rng in zip(STREAMS, rngs)},
+    }
+
+
+def extend_chunked(stem, n_new_days, chunk_days=100_000):
+    """
+    Append n_new_days days to a dataset written by generate_chunked.
+
+    Reloads <stem>.state.json (last cumulative log-price and close, the
+    returns inside the longest rolling window and the RNG states), so only the
+    new days are simulated and priced. They are written as new segment files
+    next to the existing ones (see storage.segment_paths). The result matches
+    generating the longer history in one run: prices and strikes exactly,
+    the long-window volatility features up to rounding (~1e-13).
+    Returns the list of written files.
+    """
+    with open(state_path(stem)) as f:
+        state = json.load(f)
+    return run_chunks(stem, state, n_new_days, chunk_days, mode="a")
+
+
+def advance_state(state, n_days, chunk_days=100_000):
+    """
+    The state after simulating n_days more days of the path, without pricing
+    or writing anything.
+
+    Only the volatility and return streams are drawn; the strike-factor and
+    contract-volatility streams take one 64-bit output per uniform draw, so
+    they are advanced in O(1) with PCG64.advance.
+    """
+    p = state["params"]
+    rngs = _load_rngs(state)
+    log_price = state["log_price"]
+    previous_close = np.nan if state["previous_close"] is None else state["previous_close"]
+    lookback = max(p["windows"]) - 1
+    tail_returns = np.array(state["tail_returns"], dtype=float)
+
+    for start in range(0, n_days, chunk_days):
+        m = min(chunk_days, n_days - start)
+        close, log_returns, log_price, previous_close = _simulate_path(p, rngs, m, log_price, previous_close)
+        tail_returns = np.concatenate((tail_returns, log_returns))[-lookback:] if lookback else np.empty(0)
+
+    rngs["call_factors"].bit_generator.advance(n_days * len(CALL_STRIKE_FACTORS))
+    rngs["put_factors"].bit_generator.advance(n_days * len(PUT_STRIKE_FACTORS))
+    rngs["contract_volatility"].bit_generator.advance(n_days)
+    return _updated_state(state, state["n_days"] + n_days, log_price, previous_close, tail_returns, rngs)
+
+
+def _load_rngs(state):
+    rngs = {}
+    for name in STREAMS:
+        rngs[name] = np.random.default_rng()
+        rngs[name].bit_generator.state = state["rng_states"][name]
+    return rngs
+
+
+def _updated_state(state, n_days, log_price, previous_close, tail_returns, rngs):
+    return {
+        **state,
+        "n_days": n_days,
+        "log_price": float(log_price),
+        "previous_close": None if np.isnan(previous_close) else float(previous_close),
+        "tail_returns": tail_returns.tolist(),
+        "rng_states": {name: rng.bit_generator.state for name, rng in rngs.items()},
+    }
+
+
+def _simulate_path(p, rngs, m, log_price, previous_close):
+    """Next m closes and log returns, continuing from the last log-price and close."""
+    # Geometric Brownian Motion with a random daily volatility
+    annual_volatilities = rngs["annual_volatility"].uniform(p["min_annual_volatility"],
+                                                            p["max_annual_volatility"], m)
+    daily_returns = rngs["returns"].normal(p["mu"] * p["dt"], annual_volatilities / np.sqrt(252), m)
+    cumulative = np.cumsum(np.concatenate(([log_price], daily_returns)))[1:]
+    close = p["initial_price"] * np.exp(cumulative)
+    log_returns = np.log(close / np.concatenate(([previous_close], close[:-1])))
+    return close, log_returns, cumulative[-1], close[-1]
+
+
+def run_chunks(stem, state, n_days, chunk_days, mode):
+    """
+    Generate, price and write n_days days starting from state, chunk_days at
+    a time, then save the new state to <stem>.state.json.
+
+    mode: "w" starts the dataset at stem, "a" appends to it
+    Returns the list of written files.
+    """
+    p = state["params"]
+    windows = p["windows"]
+    rngs = _load_rngs(state)
+    call_low, call_high = np.array(CALL_STRIKE_FACTORS).T
+    put_low, put_high = np.array(PUT_STRIKE_FACTORS).T
+    first_date = np.busday_offset(np.datetime64(p["start_date"], "D"), 0, roll="forward")
+
+    # State carried across chunk boundaries
+    log_price = state["log_price"]
+    previous_close = np.nan if state["previous_close"] is None else state["previous_close"]
+    lookback = max(windows) - 1
+    tail_returns = np.array(state["tail_returns"], dtype=float)
+    offset = state["n_days"]
+
+    with DatasetAppender(stem, p["output_format"], mode) as out:
+        for start in range(offset, offset + n_days, chunk_days):
+            m = min(chunk_days, offset + n_days - start)
+
+            with phase("simulation", m):
+                close, log_returns, log_price, previous_close = _simulate_path(p, rngs, m, log_price,
+                                                                               previous_close)
+                dates = np.busday_offset(first_date, np.arange(start, start + m))
+
+            with phase("rolling volatility", m):
+                # Rolling volatility over the carried tail plus this chunk
+                history = np.concatenate((tail_returns, log_returns))
+                rolling_stds = np.nan_to_num(rolling_std(history, windows)[:, tail_returns.size:], nan=0.0)
+                tail_returns = history[-lookback:] if lookback else np.empty(0)
+
+            with phase("strike-factor sampling", m):
+                call_factors = rngs["call_factors"].uniform(call_low, call_high, (m, len(call_low)))
+                put_factors = rngs["put_factors"].uniform(put_low, put_high, (m, len(put_low)))
+                volatilities = rngs["contract_volatility"].uniform(p["min_annual_volatility"],
+                                                                   p["max_annual_volatility"], m)
+
+            calls_df, puts_df = option_frames(dates, close, rolling_stds, windows, volatilities,
+                                              call_factors, put_factors, p["expiration_days"], p["r"], p["greeks"])
+
+            skip = max(p["drop_days"] - start, 0)
+            if skip < m:
+                with phase("write", 2 * (m - skip)):
+                    out.append({"Calls": calls_df.iloc[skip:], "Puts": puts_df.iloc[skip:]})
+
+    state = _updated_state(state, offset + n_days, log_price, previous_close, tail_returns, rngs)
+    with open(state_path(stem), "w") as f:
+        json.dump(state, f, indent=2)
+    return out.paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic option dataset in bounded-memory chunks.")
+    parser.add_argument("stem", help="output path without extension, e.g. training_data_synthetic_4")
+    days = parser.add_mutually_exclusive_group(required=True)
+    days.add_argument("--n-days", type=int, help="generate a new dataset with this many days")
+    days.add_argument("--extend", type=int, metavar="N_DAYS",
+                      help="append N_DAYS new days to an existing dataset, continuing from its saved state")
+    parser.add_argument("--initial-price", type=float, default=100)
+    parser.add_argument("--start-date", default="1930-01-01")
+    parser.add_argument("--chunk-days", type=int, default=100_000)
+    parser.add_argument("--seed", type=int, default=100)
+    parser.add_argument("--format", dest="output_format", choices=["parquet", "feather"], default="parquet")
+    parser.add_argument("--greeks", action="store_true", help="add Greeks columns per contract")
+    parser.add_argument("--profile", metavar="REPORT", help="write a per-phase profiling report (JSON) to REPORT")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable(args.profile)
+
+    if args.extend is not None:
+        print("\n".join(extend_chunked(args.stem, args.extend, args.chunk_days)))
+        return
+    paths = generate_chunked(args.stem, args.n_days, args.initial_price, args.start_date,
+                             seed=args.seed, chunk_days=args.chunk_days, output_format=args.output_format,
+                             greeks=args.greeks)
+    print("\n".join(paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from gis_common.generator import SPLITS, simulate_days
+from gis_common.pipeline import GREEKS, OPTION_TYPES, WINDOWS, volatility_features
+from gis_common.pricing import black_scholes_chain, black_scholes_greeks
+from gis_common.profiling import phase, profiler
+from gis_common.storage import DatasetAppender
+
+# Default surface: 50 strikes from 60% to 140% of the close and 12 expiries
+SURFACE_STRIKE_FACTORS = np.linspace(0.60, 1.40, 50)
+SURFACE_EXPIRATION_DAYS = [7, 14, 21, 30, 45, 60, 90, 120, 180, 270, 365, 730]
+
+# Rough peak bytes per priced contract: the d1/d2/CDF temporaries of the
+# pricer plus the flattened chain columns, used to size chunks. The five
+# Greeks add their own output arrays, temporaries and chain columns (traced
+# peak about 2.5x that of prices alone).
+BYTES_PER_CONTRACT = 200
+GREEKS_BYTES_PER_CONTRACT = 300
+
+
+def surface_chunk_days(contracts_per_day, memory_budget, workers=1, greeks=False):
+    """Days per chunk so that workers chunks in flight stay within memory_budget bytes."""
+    per_contract = BYTES_PER_CONTRACT + (GREEKS_BYTES_PER_CONTRACT if greeks else 0)
+    return max(1, int(memory_budget // (per_contract * contracts_per_day * max(workers, 1))))
+
+
+def price_surface(close, volatilities, strike_factors, expiration_days, r, option_types=OPTION_TYPES, greeks=False):
+    """
+    Price a strike x expiry surface for every day by broadcasting over
+    (option type, day, expiry, strike).
+
+    strike_factors: (n_strikes,) shared by every day, or (n_days, n_strikes)
+    expiration_days: (n_expiries,) days to expiration (365-day year)
+    Returns (strikes, values): strikes has shape (n_days, n_strikes); values
+    maps "price" (and every name in GREEKS when greeks) to arrays of shape
+    (n_types, n_days, n_expiries, n_strikes).
+    """
+    close = np.asarray(close, dtype=float)
+    strikes = close[:, None] * np.asarray(strike_factors, dtype=float)
+    T = np.asarray(expiration_days, dtype=float)[:, None] / 365  # Convert days to years
+
+    args = (close[:, None, None], strikes[:, None, :], T, r, np.asarray(volatilities)[:, None, None],
+            np.array([option == "Call" for option in option_types])[:, None, None, None])
+    if greeks:
+        values = black_scholes_greeks(*args)
+        values = {"price": values["price"], **{name: values[name] for name in GREEKS}}
+    else:
+        values = {"price": black_scholes_chain(*args)}
+    return strikes, values
+
+
+def surface_tables(dates, close, rolling_stds, windows, volatilities, strike_factors=SURFACE_STRIKE_FACTORS,
+                   expiration_days=SURFACE_EXPIRATION_DAYS, r=0.05, option_types=OPTION_TYPES, greeks=False):
+    """
+    Long-format (features_df, chain_df) for a full surface, in the layout of
+    pipeline.chain_tables.
+
+    Chain rows are ordered by date, option type, expiry and strike; the
+    Moneyness column labels strike columns "K1", "K2", ...
+    """
+    n_contracts = np.size(close) * len(option_types) * len(expiration_days) * np.shape(strike_factors)[-1]
+    with phase("pricing and frame build", n_contracts):
+        return _surface_tables(dates, close, rolling_stds, windows, volatilities, strike_factors, expiration_days,
+                               r, option_types, greeks)
+
+
+def _surface_tables(dates, close, rolling_stds, windows, volatilities, strike_factors, expiration_days, r,
+                    option_types, greeks):
+    # Not instrumented: write_surface runs it in worker threads, and the
+    # profiler's phases are not thread-safe
+    close = np.asarray(close, dtype=float)
+    n_days = close.size
+    n_types, n_expiries = len(option_types), len(expiration_days)
+    n_strikes = np.shape(strike_factors)[-1]
+    per_day = n_types * n_expiries * n_strikes
+
+    strikes, values = price_surface(close, volatilities, strike_factors, expiration_days, r, option_types, greeks)
+
+    def rows(a):
+        return np.broadcast_to(a, (n_types, n_days, n_expiries, n_strikes)).transpose(1, 0, 2, 3).ravel()
+
+    codes = np.arange(per_day)
+    chain_df = pd.DataFrame({
+        "Date": np.repeat(np.asarray(dates), per_day),
+        "Option Type": pd.Categorical.from_codes(np.tile(codes // (n_expiries * n_strikes), n_days),
+                                                 list(option_types)),
+        "Moneyness": pd.Categorical.from_codes(np.tile(codes % n_strikes, n_days),
+                                               [f"K{j + 1}" for j in range(n_strikes)]),
+        "Expiration Days": np.tile(np.repeat(np.asarray(expiration_days), n_strikes), n_types * n_days),
+        "Strike": rows(strikes[None, :, None, :]),
+        **{("Price" if name == "price" else name.capitalize()): rows(v) for name, v in values.items()},
+    })
+    features_df = pd.DataFrame({
+        "Date": np.asarray(dates),
+        "Underlying Price": close,
+        **volatility_features(rolling_stds, windows, close, volatilities),
+    })
+    return features_df, chain_df
+
+
+def write_surface(stem, dates, close, rolling_stds, windows, volatilities, strike_factors=SURFACE_STRIKE_FACTORS,
+                  expiration_days=SURFACE_EXPIRATION_DAYS, r=0.05, option_types=OPTION_TYPES, greeks=False,
+                  memory_budget=2 * 1024 ** 3, workers=None, output_format="parquet"):
+    """
+    Price a surface chunk by chunk and append it to <stem>.Features.* and <stem>.Chain.*
+
+    Days are split into chunks sized by surface_chunk_days so that the chunks
+    being priced at once fit in memory_budget bytes. A thread pool prices
+    `workers` chunks at a time (the NumPy/SciPy kernels release the GIL) and
+    chunks are written in day order as each wave completes. With greeks the
+    chunks are sized for the larger per-contract footprint.
+    Returns the list of written files.
+    """
+    workers = workers or os.cpu_count() or 1
+    n_days = np.size(close)
+    per_day = len(option_types) * len(expiration_days) * np.shape(strike_factors)[-1]
+    chunk_days = surface_chunk_days(per_day, memory_budget, workers, greeks)
+    per_day_factors = np.ndim(strike_factors) == 2
+
+    def build(start):
+        days = slice(start, min(start + chunk_days, n_days))
+        return _surface_tables(np.asarray(dates)[days], np.asarray(close)[days], rolling_stds[:, days], windows,
+                               np.asarray(volatilities)[days],
+                               strike_factors[days] if per_day_factors else strike_factors,
+                               expiration_days, r, option_types, greeks)
+
+    starts = list(range(0, n_days, chunk_days))
+    with DatasetAppender(stem, output_format) as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        # One wave of chunks in flight at a time keeps memory within the budget
+        for wave in range(0, len(starts), workers):
+            wave_starts = starts[wave:wave + workers]
+            wave_days = min(wave_starts[-1] + chunk_days, n_days) - wave_starts[0]
+            # Timed from this thread as a whole: the profiler's phases are not thread-safe
+            with phase("pricing and frame build", wave_days * per_day):
+                tables = list(pool.map(build, wave_starts))
+            for features_df, chain_df in tables:
+                with phase("write", len(chain_df)):
+                    out.append({"Features": features_df, "Chain": chain_df})
+    return out.paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a strike x expiry option surface for a simulated split.")
+    parser.add_argument("stem", help="output path without extension, e.g. training_surface")
+    parser.add_argument("--split", choices=list(SPLITS), default="train")
+    parser.add_argument("--strikes", type=int, default=len(SURFACE_STRIKE_FACTORS),
+                        help="number of strikes between --min-factor and --max-factor")
+    parser.add_argument("--min-factor", type=float, default=SURFACE_STRIKE_FACTORS[0])
+    parser.add_argument("--max-factor", type=float, default=SURFACE_STRIKE_FACTORS[-1])
+    parser.add_argument("--expiries", type=int, nargs="+", default=SURFACE_EXPIRATION_DAYS,
+                        help="days to expiration")
+    parser.add_argument("--memory-budget-gb", type=float, default=2.0)
+    parser.add_argument("--workers", type=int, default=None, help="pricing threads (default: all cores)")
+    parser.add_argument("--seed", type=int, default=100)
+    parser.add_argument("--format", dest="output_format", choices=["parquet", "feather"], default="parquet")
+    parser.add_argument("--greeks", action="store_true", help="add Greeks columns per contract")
+    parser.add_argument("--profile", metavar="REPORT", help="write a per-phase profiling report (JSON) to REPORT")
+    args = parser.parse_args()
+    if args.profile:
+        profiler.enable(args.profile)
+
+    params = SPLITS[args.split]
+    drop_days = 90
+    days = simulate_days(params["n_days"], params["initial_price"], rng=np.random.RandomState(args.seed))
+    dates = pd.date_range(start=params["start_date"], periods=params["n_days"], freq="B")  # Business days
+    kept = slice(drop_days, None)
+    paths = write_surface(args.stem, dates[kept], days["close"][kept], days["rolling_stds"][:, kept], WINDOWS,
+                          days["volatilities"][kept], np.linspace(args.min_factor, args.max_factor, args.strikes),
+                          args.expiries, greeks=args.greeks, memory_budget=args.memory_budget_gb * 1024 ** 3,
+                          workers=args.workers, output_format=args.output_format)
+    print("\n".join(paths))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+import argparse
+import itertools
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from gis_common.streaming import child_seeds, generate_chunked
+
+# Parameters that can be swept, with the values used by the split scripts
+SWEEP_DEFAULTS = {
+    "mu": [0.0005],
+    "r": [0.05],
+    "min_annual_volatility": [0.01],
+    "max_annual_volatility": [0.4],
+    "expiration_days": [30],
+}
+
+
+def scenario_grid(**values):
+    """
+    Cartesian product of parameter values, e.g.
+    scenario_grid(mu=[0.0005, 0.001], r=[0.03, 0.05]) -> 4 scenarios.
+    Parameters that are not given keep their SWEEP_DEFAULTS value.
+    """
+    unknown = set(values) - set(SWEEP_DEFAULTS)
+    if unknown:
+        raise ValueError(f"Unknown sweep parameters: {sorted(unknown)}")
+    grid = {**SWEEP_DEFAULTS, **values}
+    names = list(grid)
+    return [dict(zip(names, combo)) for combo in itertools.product(*grid.values())]
+
+
+def _run_scenario(task):
+    stem, params, seed_seq, kwargs = task
+    return generate_chunked(stem, seed=seed_seq, **params, **kwargs)
+
+
+def run_sweep(scenarios, out_dir, n_days, initial_price, start_date, seed=100, workers=None,
+              output_format="parquet", chunk_days=100_000):
+    """
+    Generate one dataset per scenario across a process pool.
+
+    Scenario i draws from child i of np.random.SeedSequence(seed), so every
+    dataset depends only on its own parameters, the root seed and its index,
+    never on the number of workers or the order in which they finish.
+
+    Writes out_dir/scenario_<i>.* plus out_dir/manifest.json and returns the manifest.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    seeds = child_seeds(seed, len(scenarios))
+    common = {
+        "n_days": n_days,
+        "initial_price": initial_price,
+        "start_date": start_date,
+        "output_format": output_format,
+        "chunk_days": chunk_days,
+    }
+    tasks = [
+        (os.path.join(out_dir, f"scenario_{i:04d}"), params, seeds[i], common)
+        for i, params in enumerate(scenarios)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        files = list(pool.map(_run_scenario, tasks))
+
+    manifest = {
+        "seed": seed,
+        **{k: v for k, v in common.items() if k != "chunk_days"},
+        "scenarios": [
+            {
+                "id": i,
+                "params": params,
+                "spawn_key": list(seeds[i].spawn_key),
+                "files": [os.path.relpath(path, out_dir) for path in paths],
+            }
+            for i, (params, paths) in enumerate(zip(scenarios, files))
+        ],
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate one synthetic dataset per parameter combination.")
+    parser.add_argument("out_dir")
+    parser.add_argument("--n-days", type=int, default=15090)
+    parser.add_argument("--initial-price", type=float, default=100)
+    parser.add_argument("--start-date", default="1930-01-01")
+    parser.add_argument("--seed", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None, help="process count (default: all cores)")
+    parser.add_argument("--format", dest="output_format", choices=["parquet", "feather"], default="parquet")
+    for name, default in SWEEP_DEFAULTS.items():
+        kind = int if name == "expiration_days" else float
+        parser.add_argument("--" + name.replace("_", "-"), type=kind, nargs="+", default=default)
+    args = parser.parse_args()
+
+    scenarios = scenario_grid(**{name: getattr(args, name) for name in SWEEP_DEFAULTS})
+    manifest = run_sweep(scenarios, args.out_dir, args.n_days, args.initial_price, args.start_date,
+                         seed=args.seed, workers=args.workers, output_format=args.output_format)
+    print(f"Wrote {len(manifest['scenarios'])} scenarios to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,24 @@
+import os
+import sys
+
 import pandas as pd
 import matplotlib.pyplot as plt
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from gis_common.storage import read_dataset
+
 
 
 
-# Load the provided Excel file
-file_path = "./training_data_synthetic_4.xlsx"
-calls_df = pd.read_excel(file_path, sheet_name="Calls")
-puts_df = pd.read_excel(file_path, sheet_name="Puts")
+# Load only the plotted columns (Parquet/Feather if generated, otherwise the
+# Excel file through its columnar cache)
+file_path = "./training_data_synthetic_4"
+windows = [3, 9, 21, 30, 60, 90]
+calls_df = read_dataset(file_path, sheet_name="Calls", columns=[
+    "Date", "Call Price_ITM_1", "Call Price_ITM_2", "Call Price_OTM_1", "Call Price_OTM_2",
+    *[f"{w}_Day_Volatility" for w in windows], *[f"{w}_Day_Percent_Volatility" for w in windows]])
+puts_df = read_dataset(file_path, sheet_name="Puts", columns=[
+    "Date", "Put Price_ITM_1", "Put Price_ITM_2", "Put Price_OTM_1", "Put Price_OTM_2"])
 
 # Extract relevant columns for plotting
 calls_plot_data = calls_df[["Date", "Call Price_ITM_1", "Call Price_ITM_2", "Call Price_OTM_1", "Call Price_OTM_2"]]
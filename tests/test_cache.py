@@ -0,0 +1,39 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from gis_common.cache import DatasetCache
+
+
+def store_many(task):
+    cache_dir, work_dir, worker = task
+    cache = DatasetCache(cache_dir, max_bytes=3 * 4096)
+    os.makedirs(work_dir)
+    path = os.path.join(work_dir, "data.bin")
+    for i in range(20):
+        with open(path, "wb") as f:
+            f.write(os.urandom(4096))
+        cache.store(f"key-{worker}-{i}", [path], {"worker": worker, "i": i})
+        cache.entries()
+    return worker
+
+
+def test_concurrent_store(tmp_path):
+    cache_dir = str(tmp_path / "cache")
+    tasks = [(cache_dir, str(tmp_path / f"work-{worker}"), worker) for worker in range(4)]
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        assert list(pool.map(store_many, tasks)) == [0, 1, 2, 3]
+
+    cache = DatasetCache(cache_dir, max_bytes=3 * 4096)
+    entries = cache.entries()
+    assert entries and all(key.startswith("key-") for key, _, _ in entries)
+    assert sum(size for _, size, _ in entries) <= cache.max_bytes
+    assert os.listdir(os.path.join(cache_dir, ".staging")) == []
+    for key, _, _ in entries:
+        assert cache.restore(key, [str(tmp_path / "data.bin")])
+
+
+def test_entries_skip_partial_entry(tmp_path):
+    cache = DatasetCache(str(tmp_path))
+    os.makedirs(tmp_path / "partial")
+    (tmp_path / "partial" / "entry.json").write_text("")
+    assert cache.entries() == []
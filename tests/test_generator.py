@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from gis_common.generator import build_split, generate_split
+from gis_common.volatility import rolling_std
+
+WINDOWS = [3, 9, 21, 30, 60, 90]
+
+
+def legacy_black_scholes(S, K, T, r, sigma, option_type):
+    d1 = (np.log(S / K) + (r + 0.5 * sigma ** 2) * T) / (sigma * np.sqrt(T))
+    d2 = d1 - sigma * np.sqrt(T)
+    if option_type == "call":
+        return S * norm.cdf(d1) - K * np.exp(-r * T) * norm.cdf(d2)
+    return K * np.exp(-r * T) * norm.cdf(-d2) - S * norm.cdf(-d1)
+
+
+def legacy_split(n_days, initial_price, start_date, seed=100, mu=0.0005, dt=1 / 252, r=0.05, expiration_days=30,
+                 pandas_rolling=False):
+    """
+    The day-by-day loop of the original gis_call/*.py scripts, drawing from
+    one RandomState. Their pandas rolling stds agree with rolling_std to
+    ~1e-14 relative, not bit for bit, so rolling_std is used unless
+    pandas_rolling.
+    """
+    rng = np.random.RandomState(seed)
+    annual_volatilities = rng.uniform(0.01, 0.4, n_days)
+    daily_returns = rng.normal(mu * dt, annual_volatilities / np.sqrt(252), n_days)
+    data = pd.DataFrame({"Date": pd.date_range(start=start_date, periods=n_days, freq="B"),
+                         "Close": initial_price * np.exp(np.cumsum(daily_returns))})
+    log_returns = np.log(data["Close"] / data["Close"].shift(1))
+    if pandas_rolling:
+        stds = {w: log_returns.rolling(window=w).std().fillna(0) for w in WINDOWS}
+    else:
+        stds = dict(zip(WINDOWS, (pd.Series(np.nan_to_num(s, nan=0.0)) for s in rolling_std(log_returns, WINDOWS))))
+    annualized = {w: stds[w] * np.sqrt(252) for w in WINDOWS}
+    percent = {w: annualized[w] * 100 * np.sqrt(w / 252) for w in WINDOWS}
+    T = expiration_days / 365
+
+    itm_call_1, itm_call_2 = rng.uniform(0.90, 0.99, n_days), rng.uniform(0.80, 0.90, n_days)
+    otm_call_1, otm_call_2 = rng.uniform(0.70, 0.80, n_days), rng.uniform(0.60, 0.70, n_days)
+    put_factors = [rng.uniform(low, high, n_days) for low, high in [(1.01, 1.10), (1.10, 1.20), (1.20, 1.30),
+                                                                    (1.30, 1.40)]]
+    calls, puts = [], []
+    for i in range(n_days):
+        price = data["Close"].iloc[i]
+        volatility = rng.uniform(0.01, 0.4)
+        features = {"Date": data["Date"].iloc[i], "Underlying Price": price, "Expiration Days": expiration_days,
+                    **{f"{w}_Day_Volatility": annualized[w].iloc[i] * price * volatility for w in WINDOWS},
+                    **{f"{w}_Day_Percent_Volatility": percent[w].iloc[i] for w in WINDOWS}}
+        call_row, put_row = dict(features), dict(features)
+        for suffix, factor in zip(["ITM_1", "ITM_2", "OTM_1", "OTM_2"],
+                                  [otm_call_1, otm_call_2, itm_call_1, itm_call_2]):
+            strike = price * factor[i]
+            call_row[f"Strike_{suffix}"] = strike
+            call_row[f"Call Price_{suffix}"] = legacy_black_scholes(price, strike, T, r, volatility, "call")
+        for suffix, factor in zip(["ITM_1", "ITM_2", "OTM_1", "OTM_2"], put_factors):
+            strike = price * factor[i]
+            put_row[f"Strike_{suffix}"] = strike
+            put_row[f"Put Price_{suffix}"] = legacy_black_scholes(price, strike, T, r, volatility, "put")
+        calls.append(call_row)
+        puts.append(put_row)
+    return (pd.DataFrame(calls).iloc[90:].reset_index(drop=True),
+            pd.DataFrame(puts).iloc[90:].reset_index(drop=True))
+
+
+def test_generate_split_matches_legacy_scripts():
+    calls_df, puts_df = generate_split(400, 190.623391982309, "2007-05-09")
+    legacy_calls, legacy_puts = legacy_split(400, 190.623391982309, "2007-05-09")
+    pd.testing.assert_frame_equal(calls_df, legacy_calls, check_exact=True)
+    pd.testing.assert_frame_equal(puts_df, legacy_puts, check_exact=True)
+
+    pandas_calls, _ = legacy_split(400, 190.623391982309, "2007-05-09", pandas_rolling=True)
+    pd.testing.assert_frame_equal(calls_df, pandas_calls, check_exact=False, rtol=1e-9)
+
+
+def test_build_split_creates_out_dir(tmp_path):
+    out_dir = tmp_path / "new_dir"
+    calls_df, _ = build_split("val", out_dir=str(out_dir), cache=False)
+    assert (out_dir / "validation_data_synthetic_4.Calls.parquet").exists()
+    assert len(calls_df) == 5000
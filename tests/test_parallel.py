@@ -0,0 +1,18 @@
+import numpy as np
+
+from gis_common.parallel import BLOCK_DAYS, simulate_close_parallel
+
+
+def test_path_independent_of_workers(tmp_path):
+    n_days = 2 * BLOCK_DAYS + 1000  # three blocks, the last one partial
+    reference = simulate_close_parallel(n_days, 100, workers=1)
+    assert reference.shape == (n_days,) and np.isfinite(reference).all()
+    for workers in [2, 3]:
+        np.testing.assert_array_equal(simulate_close_parallel(n_days, 100, workers=workers), reference)
+    on_disk = simulate_close_parallel(n_days, 100, workers=2, path=str(tmp_path / "close.npy"))
+    np.testing.assert_array_equal(on_disk, reference)
+
+
+def test_zero_days(tmp_path):
+    assert simulate_close_parallel(0, 100).shape == (0,)
+    assert simulate_close_parallel(0, 100, path=str(tmp_path / "close.npy")).shape == (0,)
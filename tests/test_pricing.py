@@ -0,0 +1,35 @@
+import numpy as np
+
+from gis_common.pricing import black_scholes_chain, black_scholes_greeks, implied_volatility
+
+
+def random_quotes(n=100_000, seed=0):
+    rng = np.random.default_rng(seed)
+    S = rng.uniform(50, 150, n)
+    K = S * rng.uniform(0.6, 1.4, n)
+    T = rng.uniform(7, 730, n) / 365
+    sigma = rng.uniform(0.02, 1.0, n)
+    is_call = rng.random(n) < 0.5
+    return S, K, T, 0.05, sigma, is_call
+
+
+def test_implied_volatility_recovers_sigma():
+    S, K, T, r, sigma, is_call = random_quotes()
+    values = black_scholes_greeks(S, K, T, r, sigma, is_call)
+    iv = implied_volatility(values["price"], S, K, T, r, is_call)
+    # Where vega is not negligible, sigma is determined by the price
+    sensitive = values["vega"] > 0.01
+    assert not np.isnan(iv[sensitive]).any()
+    np.testing.assert_allclose(iv[sensitive], sigma[sensitive], rtol=0, atol=1e-11)
+    # Everywhere else the solved sigma still reprices the quote
+    solved = ~np.isnan(iv)
+    np.testing.assert_allclose(black_scholes_chain(S, K, T, r, iv, is_call)[solved], values["price"][solved],
+                               rtol=0, atol=1e-12)
+
+
+def test_implied_volatility_outside_bounds_is_nan():
+    S, K, T, r = 100.0, np.array([90.0, 110.0]), 0.5, 0.05
+    is_call = np.array([True, False])
+    intrinsic = np.maximum(np.where(is_call, S - K * np.exp(-r * T), K * np.exp(-r * T) - S), 0)
+    assert np.isnan(implied_volatility(intrinsic - 0.01, S, K, T, r, is_call)).all()
+    assert np.isnan(implied_volatility(np.array([S + 1, K[1] + 1]), S, K, T, r, is_call)).all()
@@ -0,0 +1,32 @@
+import os
+
+from gis_common.shards import ShardedDataset, file_checksum, finalize, generate_shard, plan_shards
+
+
+def test_regenerated_shard_has_same_checksum(tmp_path):
+    out_dir = str(tmp_path)
+    plan_shards(out_dir, 400, 200, 100, "1930-01-01", chunk_days=150)
+    first = generate_shard(out_dir, 1)
+    os.remove(os.path.join(out_dir, first["files"]["Calls"]["path"]))
+    second = generate_shard(out_dir, 1)
+    assert second["files"] == first["files"]
+
+
+def test_verify_before_and_after_finalize(tmp_path):
+    out_dir = str(tmp_path)
+    plan_shards(out_dir, 400, 200, 100, "1930-01-01", chunk_days=150)
+    sidecar = generate_shard(out_dir, 0)
+    # Shard 1 is not generated yet: nothing to check it against
+    assert ShardedDataset(out_dir).verify() == ([], ["shard-00001"])
+
+    path = os.path.join(out_dir, sidecar["files"]["Calls"]["path"])
+    with open(path, "ab") as f:
+        f.write(b"garbage")
+    assert ShardedDataset(out_dir).verify() == (["shard-00000"], ["shard-00001"])
+
+    generate_shard(out_dir, 0)
+    generate_shard(out_dir, 1)
+    manifest = finalize(out_dir)
+    assert manifest["shards"][1]["files"]["Puts"]["sha256"] == file_checksum(
+        os.path.join(out_dir, manifest["shards"][1]["files"]["Puts"]["path"]))
+    assert ShardedDataset(out_dir, "Puts").verify() == ([], [])
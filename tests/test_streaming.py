@@ -0,0 +1,22 @@
+import pandas as pd
+import pytest
+
+from gis_common.storage import read_dataset
+from gis_common.streaming import extend_chunked, generate_chunked
+
+
+@pytest.mark.parametrize("first_days", [60, 250])
+def test_extend_matches_one_longer_run(tmp_path, first_days):
+    # 60 days is still inside the 90-day warm-up, so the first run writes no rows
+    generate_chunked(str(tmp_path / "whole"), 400, 100, "1930-01-01", chunk_days=150)
+    generate_chunked(str(tmp_path / "extended"), first_days, 100, "1930-01-01", chunk_days=150)
+    extend_chunked(str(tmp_path / "extended"), 400 - first_days, chunk_days=150)
+    for sheet in ["Calls", "Puts"]:
+        extended = read_dataset(str(tmp_path / "extended"), sheet)
+        whole = read_dataset(str(tmp_path / "whole"), sheet)
+        # Long-window rolling sums restart at chunk boundaries, so the
+        # volatility features only agree to rounding
+        features = [c for c in whole.columns if c.endswith("_Volatility")]
+        pd.testing.assert_frame_equal(extended.drop(columns=features), whole.drop(columns=features),
+                                      check_exact=True)
+        pd.testing.assert_frame_equal(extended[features], whole[features], check_exact=False, rtol=1e-12)
@@ -0,0 +1,18 @@
+import os
+
+from gis_common.sweep import run_sweep, scenario_grid
+
+
+def read_files(out_dir, manifest):
+    return {path: open(os.path.join(out_dir, path), "rb").read()
+            for scenario in manifest["scenarios"] for path in scenario["files"]}
+
+
+def test_sweep_independent_of_workers(tmp_path):
+    scenarios = scenario_grid(mu=[0.0005, 0.001], r=[0.03, 0.05])
+    outputs = []
+    for workers in [1, 3]:
+        out_dir = str(tmp_path / f"workers-{workers}")
+        manifest = run_sweep(scenarios, out_dir, 300, 100, "1930-01-01", workers=workers, chunk_days=120)
+        outputs.append((manifest, read_files(out_dir, manifest)))
+    assert outputs[0] == outputs[1]
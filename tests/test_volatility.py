@@ -0,0 +1,40 @@
+import numpy as np
+import pandas as pd
+
+from gis_common.volatility import RollingVolatility, rolling_std
+
+WINDOWS = [3, 9, 21, 30, 60, 90]
+
+
+def simulated_close(n_days=20000, seed=0):
+    # GBM with a random daily volatility, as in the generators
+    rng = np.random.default_rng(seed)
+    daily = rng.uniform(0.01, 0.4, n_days) / np.sqrt(252) * rng.standard_normal(n_days) + 0.0005 / 252
+    return 100 * np.exp(np.cumsum(daily))
+
+
+def log_returns(close):
+    return np.concatenate(([np.nan], np.log(close[1:] / close[:-1])))
+
+
+def test_rolling_std_matches_pandas():
+    returns = log_returns(simulated_close())
+    stds = rolling_std(returns, WINDOWS)
+    expected = np.array([pd.Series(returns).rolling(w).std().to_numpy() for w in WINDOWS])
+    np.testing.assert_array_equal(np.isnan(stds), np.isnan(expected))
+    np.testing.assert_allclose(stds, expected, rtol=5e-9)
+
+
+def test_online_matches_batch():
+    close = simulated_close()
+    batch = rolling_std(log_returns(close), WINDOWS)
+    online = RollingVolatility(WINDOWS).extend(close)
+    np.testing.assert_array_equal(np.isnan(online), np.isnan(batch))
+    np.testing.assert_allclose(online, batch, rtol=5e-12)
+
+
+def test_online_update_matches_extend():
+    close = simulated_close(500)
+    estimator = RollingVolatility(WINDOWS, refresh_every=64)
+    updates = np.array([estimator.update(price) for price in close]).T
+    np.testing.assert_array_equal(updates, RollingVolatility(WINDOWS, refresh_every=64).extend(close))